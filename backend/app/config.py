@@ -15,6 +15,13 @@ class Config:
     # Database URL with properly encoded password
     DATABASE_URL = f"mysql+aiomysql://{MYSQL_USER}:{quote_plus(MYSQL_PASSWORD)}@{MYSQL_HOST}:{MYSQL_PORT}/{MYSQL_DATABASE}"
     
+    # Connection pool (pre-filled to DB_POOL_SIZE at startup)
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 20))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))  # below MySQL's wait_timeout
+    # Ping on every checkout - only needed when idle connections get dropped early
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "0") == "1"
+    
     # Raft Node Configuration
     NODE_PORTS = {
         1: 8001,
@@ -33,6 +40,22 @@ class Config:
         5: 9005
     }
     
+    # Randomly transfer leadership now and then to show elections in the UI
+    RAFT_DEMO_CHURN = os.getenv("RAFT_DEMO_CHURN", "0") == "1"
+    
+    # UDP heartbeats listen on RAFT_PORTS[node_id] + this offset
+    HEARTBEAT_PORT_OFFSET = 100
+    
+    # CPU each node's process is pinned to (Linux, opt-in via RAFT_PIN_CPUS=1)
+    PIN_CPUS = os.getenv("RAFT_PIN_CPUS", "0") == "1"
+    NODE_CPUS = {
+        1: 0,
+        2: 1,
+        3: 2,
+        4: 3,
+        5: 4
+    }
+    
     # Initial cluster (starting with 3 nodes)
     INITIAL_CLUSTER_SIZE = 3
     
@@ -40,6 +63,16 @@ class Config:
     HEARTBEAT_INTERVAL = 0.1  # 100ms
     ELECTION_TIMEOUT_MIN = 0.15  # 150ms
     ELECTION_TIMEOUT_MAX = 0.3   # 300ms
+    
+    # Max concurrent AppendEntries per follower (2 keeps the link busy without
+    # starving the batcher of entries to coalesce)
+    RAFT_MAX_IN_FLIGHT = int(os.getenv("RAFT_MAX_IN_FLIGHT", 2))
+    # Max encoded size of one AppendEntries / catch-up batch
+    RAFT_MAX_APPEND_BYTES = int(os.getenv("RAFT_MAX_APPEND_BYTES", 2 * 1024 * 1024))
+    # Max entries per catch-up chunk (also capped by RAFT_MAX_APPEND_BYTES)
+    RAFT_CATCH_UP_CHUNK_ENTRIES = int(os.getenv("RAFT_CATCH_UP_CHUNK_ENTRIES", 1000))
+    # Max client writes the leader appends to its log in one go
+    RAFT_MAX_WRITE_BATCH = int(os.getenv("RAFT_MAX_WRITE_BATCH", 128))
 
 class DevelopmentConfig(Config):
     DEBUG = True
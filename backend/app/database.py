@@ -1,3 +1,5 @@
+import asyncio
+from quart import g
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from .config import config
@@ -7,7 +9,10 @@ from .models.task import Base
 engine = create_async_engine(
     config.DATABASE_URL,
     echo=config.DEBUG,
-    pool_pre_ping=True
+    pool_pre_ping=config.DB_POOL_PRE_PING,
+    pool_size=config.DB_POOL_SIZE,
+    max_overflow=config.DB_MAX_OVERFLOW,
+    pool_recycle=config.DB_POOL_RECYCLE
 )
 
 # Create async session factory
@@ -17,10 +22,37 @@ async_session = sessionmaker(
     expire_on_commit=False
 )
 
+# Read-only sessions run in autocommit mode, so GETs skip the BEGIN/COMMIT pair
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+read_session = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+    await warm_pool()
+
+async def warm_pool():
+    """Open pool_size connections up front so early requests skip the MySQL handshake."""
+    connections = await asyncio.gather(*[engine.connect() for _ in range(config.DB_POOL_SIZE)])
+    for conn in connections:
+        await conn.close()
+
+def get_read_session() -> AsyncSession:
+    """Read-only session shared by the current request, closed on teardown."""
+    if 'db_session' not in g:
+        g.db_session = read_session()
+    return g.db_session
+
+async def close_read_session(exc=None):
+    """Teardown hook - return the request's read session to the pool."""
+    session = g.pop('db_session', None)
+    if session is not None:
+        await session.close()
 
 async def get_session() -> AsyncSession:
     """Get a database session."""
@@ -7,8 +7,13 @@ import os
 from quart import Quart
 from quart_cors import cors
 
+try:
+    import uvloop
+except ImportError:  # uvloop isn't available on Windows
+    uvloop = None
+
 from .config import config
-from .database import init_db
+from .database import init_db, close_read_session
 from .routes.tasks import tasks_bp
 from .routes.raft import raft_bp
 from .websocket.raft_events import ws_bp
@@ -29,6 +34,9 @@ def create_app(node_id: int) -> Quart:
     app.register_blueprint(raft_bp)
     app.register_blueprint(ws_bp)
     
+    # Release the per-request read session, if a view opened one
+    app.teardown_request(close_read_session)
+    
     @app.before_serving
     async def startup():
         """Initialize services before serving."""
@@ -59,18 +67,48 @@ def create_app(node_id: int) -> Quart:
     return app
 
 
+def pin_to_cpu(node_id: int):
+    """Pin this node's process to its own core so its RPC handling doesn't migrate."""
+    if not config.PIN_CPUS or not hasattr(os, 'sched_setaffinity'):
+        return
+    try:
+        # Choose from the CPUs we may run on - a container's cpuset can exclude some
+        allowed = sorted(os.sched_getaffinity(0))
+        cpu = allowed[config.NODE_CPUS[node_id] % len(allowed)]
+        os.sched_setaffinity(0, {cpu})
+    except OSError as e:
+        print(f"⚠️  Node {node_id}: CPU pinning unavailable ({e}), running unpinned")
+        return
+    print(f"Node {node_id} pinned to CPU {cpu}")
+
+
 def run_node(node_id: int):
     """Run a single Raft node."""
     if node_id not in config.NODE_PORTS:
         print(f"Invalid node ID: {node_id}. Must be 1-5.")
         sys.exit(1)
     
+    pin_to_cpu(node_id)
+    
+    # uvloop must be the loop policy before the server creates its loop
+    if uvloop is not None:
+        uvloop.install()
+    
     app = create_app(node_id)
-    app.run(
-        host='0.0.0.0',
-        port=config.NODE_PORTS[node_id],
-        debug=config.DEBUG
-    )
+    
+    if config.DEBUG:
+        app.run(
+            host='0.0.0.0',
+            port=config.NODE_PORTS[node_id],
+            debug=config.DEBUG
+        )
+    else:
+        from hypercorn.asyncio import serve
+        from hypercorn.config import Config as HypercornConfig
+        
+        hypercorn_config = HypercornConfig()
+        hypercorn_config.bind = [f"0.0.0.0:{config.NODE_PORTS[node_id]}"]
+        asyncio.run(serve(app, hypercorn_config))
 
 
 if __name__ == '__main__':
@@ -1,42 +1,173 @@
 from sqlalchemy import Column, String, Text, Enum, DateTime, Integer, BigInteger, Boolean
+from sqlalchemy.dialects.mysql import BINARY, TINYINT
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import validates
 from sqlalchemy.sql import func
+from sqlalchemy.types import TypeDecorator
+from enum import IntEnum
+from typing import Optional
+import os
+import time
 import uuid
 
 Base = declarative_base()
 
+
+# to_dict field formats
+AS_IS = "{}"
+LABEL = "{0}.label if {0} is not None else None"
+ISOFORMAT = "{0}.isoformat() if {0} else None"
+
+
+def compile_to_dict(fields: dict):
+    """
+    Generate a to_dict method specialized for a model's fields.
+    fields maps each key to its format; every attribute is read exactly once
+    into a local and the dict literal is built in a single expression.
+    """
+    reads = "\n".join(f"    v{i} = self.{key}" for i, key in enumerate(fields))
+    items = ", ".join(
+        f"{key!r}: {fmt.format(f'v{i}')}" for i, (key, fmt) in enumerate(fields.items())
+    )
+    source = f"def to_dict(self):\n{reads}\n    return {{{items}}}\n"
+    namespace = {}
+    exec(compile(source, "<to_dict>", "exec"), namespace)
+    return namespace["to_dict"]
+
+
+class LabeledIntEnum(IntEnum):
+    """IntEnum stored as a number but exposed to the API by lowercase name."""
+    
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+    
+    @classmethod
+    def coerce(cls, value):
+        """Accept a member, its code, or its API label."""
+        if value is None or isinstance(value, cls):
+            return value
+        if isinstance(value, str):
+            return cls[value.upper()]
+        return cls(value)
+
+
+class TaskStatus(LabeledIntEnum):
+    PENDING = 0
+    IN_PROGRESS = 1
+    COMPLETED = 2
+
+
+class TaskPriority(LabeledIntEnum):
+    LOW = 0
+    MEDIUM = 1
+    HIGH = 2
+
+
+class IntEnumType(TypeDecorator):
+    """Stores a LabeledIntEnum in a TINYINT column."""
+    impl = TINYINT
+    cache_ok = True
+    
+    def __init__(self, enum_class):
+        super().__init__(unsigned=True)
+        self.enum_class = enum_class
+        
+    def process_bind_param(self, value, dialect):
+        value = self.enum_class.coerce(value)
+        return int(value) if value is not None else None
+    
+    def process_result_value(self, value, dialect):
+        return self.enum_class(value) if value is not None else None
+
+
+def uuid7() -> uuid.UUID:
+    """Time-ordered UUID (version 7): 48-bit millisecond timestamp, then random bits."""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), 'big')
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def parse_task_id(value: str) -> Optional[str]:
+    """Canonical form of a task id from the API, or None if it isn't a UUID."""
+    try:
+        return str(uuid.UUID(value))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+class BinaryUUID(TypeDecorator):
+    """Stores a UUID string as BINARY(16); the Python side always sees the string."""
+    impl = BINARY
+    cache_ok = True
+    
+    def __init__(self):
+        super().__init__(16)
+        
+    def process_bind_param(self, value, dialect):
+        return uuid.UUID(value).bytes if value is not None else None
+    
+    def process_result_value(self, value, dialect):
+        return str(uuid.UUID(bytes=value)) if value is not None else None
+
+
 class Task(Base):
     """Task model for the distributed task management system."""
     __tablename__ = "tasks"
     
-    id = Column(String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
+    id = Column(BinaryUUID(), primary_key=True, default=lambda: str(uuid7()))
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(
-        Enum('pending', 'in_progress', 'completed', name='task_status'),
-        default='pending'
-    )
-    priority = Column(
-        Enum('low', 'medium', 'high', name='task_priority'),
-        default='medium'
-    )
+    status = Column(IntEnumType(TaskStatus), default=TaskStatus.PENDING)
+    priority = Column(IntEnumType(TaskPriority), default=TaskPriority.MEDIUM)
     created_at = Column(DateTime, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
     created_by_node = Column(Integer, nullable=True)
     log_index = Column(BigInteger, nullable=True)
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "title": self.title,
-            "description": self.description,
-            "status": self.status,
-            "priority": self.priority,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-            "created_by_node": self.created_by_node,
-            "log_index": self.log_index
-        }
+    @validates('status')
+    def _coerce_status(self, key, value):
+        return TaskStatus.coerce(value)
+    
+    @validates('priority')
+    def _coerce_priority(self, key, value):
+        return TaskPriority.coerce(value)
+    
+    to_dict = compile_to_dict({
+        "id": AS_IS,
+        "title": AS_IS,
+        "description": AS_IS,
+        "status": LABEL,
+        "priority": LABEL,
+        "created_at": ISOFORMAT,
+        "updated_at": ISOFORMAT,
+        "created_by_node": AS_IS,
+        "log_index": AS_IS
+    })
+
+
+def iso_datetime(column):
+    """Select a DATETIME already formatted like datetime.isoformat(), done by MySQL."""
+    return func.date_format(column, '%Y-%m-%dT%H:%i:%s').label(column.key)
+
+
+# Columns selected by list endpoints - rows become dicts without building ORM instances
+TASK_COLUMNS = (
+    Task.id, Task.title, Task.description, Task.status, Task.priority,
+    iso_datetime(Task.created_at), iso_datetime(Task.updated_at),
+    Task.created_by_node, Task.log_index
+)
+TASK_KEYS = tuple(column.key for column in TASK_COLUMNS)
+
+
+def task_row_to_dict(row) -> dict:
+    """Serialize a TASK_COLUMNS row the same way Task.to_dict does."""
+    task = dict(zip(TASK_KEYS, row))
+    for key in ("status", "priority"):
+        if task[key] is not None:
+            task[key] = task[key].label
+    return task
 
 
 class RaftLog(Base):
@@ -55,14 +186,25 @@ class RaftLog(Base):
     committed = Column(Boolean, default=False)
     created_at = Column(DateTime, server_default=func.now())
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "term": self.term,
-            "log_index": self.log_index,
-            "operation": self.operation,
-            "task_id": self.task_id,
-            "data": self.data,
-            "committed": self.committed,
-            "created_at": self.created_at.isoformat() if self.created_at else None
-        }
+    to_dict = compile_to_dict({
+        "id": AS_IS,
+        "term": AS_IS,
+        "log_index": AS_IS,
+        "operation": AS_IS,
+        "task_id": AS_IS,
+        "data": AS_IS,
+        "committed": AS_IS,
+        "created_at": ISOFORMAT
+    })
+
+
+RAFT_LOG_COLUMNS = (
+    RaftLog.id, RaftLog.term, RaftLog.log_index, RaftLog.operation, RaftLog.task_id,
+    RaftLog.data, RaftLog.committed, iso_datetime(RaftLog.created_at)
+)
+RAFT_LOG_KEYS = tuple(column.key for column in RAFT_LOG_COLUMNS)
+
+
+def raft_log_row_to_dict(row) -> dict:
+    """Serialize a RAFT_LOG_COLUMNS row the same way RaftLog.to_dict does."""
+    return dict(zip(RAFT_LOG_KEYS, row))
@@ -2,14 +2,67 @@
 Raft Status Routes - Endpoints for Raft cluster observability.
 Includes RPC endpoints for inter-node communication.
 """
-from quart import Blueprint, jsonify, request
+import time
+import msgpack
+import orjson
+from typing import Dict, Optional, Tuple
+from quart import Blueprint, Response, jsonify, request
 from ..services.raft_cluster import get_raft_service
-from ..database import async_session
+from ..services.raft_transport import (
+    MSGPACK_MIMETYPE, RPC_APPEND_ENTRIES, RPC_HEARTBEAT, RPC_COMMIT, RPC_CATCH_UP, RPC_PROMOTE
+)
+from ..database import get_read_session
 from ..services.task_service import TaskService
 
 raft_bp = Blueprint('raft', __name__, url_prefix='/api/raft')
 
 
+async def _decode():
+    """Read an RPC request body - msgpack if the peer sent it, else JSON."""
+    if request.mimetype == MSGPACK_MIMETYPE:
+        return msgpack.unpackb(await request.get_data(), raw=False)
+    return await request.get_json()
+
+
+def _encode(obj) -> Response:
+    """Encode an RPC response like its request - msgpack, or JSON for older peers."""
+    if request.mimetype == MSGPACK_MIMETYPE:
+        return Response(msgpack.packb(obj, use_bin_type=True), mimetype=MSGPACK_MIMETYPE)
+    return _json(obj)
+
+
+def _json(obj) -> Response:
+    """Encode an observability response with orjson."""
+    return Response(orjson.dumps(obj), mimetype='application/json')
+
+
+# Serialized observability responses: endpoint -> (expiry, generation, body).
+# The TTL is shorter than the heartbeat period so pollers never see stale state
+# for long; any Raft event bumps the generation and invalidates early.
+RESPONSE_CACHE_TTL = 0.075
+_response_cache: Dict[str, Tuple[float, int, bytes]] = {}
+
+
+def _cached_response(endpoint: str, generation: int) -> Optional[Response]:
+    """Return the cached body for an endpoint if it is still fresh."""
+    cached = _response_cache.get(endpoint)
+    if cached and cached[1] == generation and time.monotonic() < cached[0]:
+        return Response(cached[2], mimetype='application/json')
+    return None
+
+
+def _store_response(endpoint: str, generation: int, body: bytes):
+    """Share a serialized body with pollers until it expires."""
+    _response_cache[endpoint] = (time.monotonic() + RESPONSE_CACHE_TTL, generation, body)
+
+
+def _cache_response(endpoint: str, generation: int, obj) -> Response:
+    """Serialize a response once and share it with pollers until it expires."""
+    body = orjson.dumps(obj)
+    _store_response(endpoint, generation, body)
+    return Response(body, mimetype='application/json')
+
+
 # =============================================================================
 # RPC Endpoints - For inter-node Raft communication
 # =============================================================================
@@ -19,82 +72,43 @@ async def rpc_append_entries():
     """
     Receive AppendEntries RPC from leader.
     This is how the leader replicates log entries to followers.
+    Accepts a batch via `entries` (or a single legacy `entry`).
     """
     raft = get_raft_service()
-    data = await request.get_json()
-    
-    leader_id = data.get('leader_id')
-    term = data.get('term')
-    entry = data.get('entry')
-    
-    success = await raft.receive_append_entries(leader_id, term, entry)
-    
-    return jsonify({
-        "success": success,
-        "node_id": raft.node_id,
-        "term": raft.term
-    })
+    data = await _decode()
+    return _encode(await raft.handle_rpc(RPC_APPEND_ENTRIES, data))
 
 
 @raft_bp.route('/rpc/heartbeat', methods=['POST'])
 async def rpc_heartbeat():
     """Receive heartbeat from leader."""
     raft = get_raft_service()
-    data = await request.get_json()
-    
-    await raft.receive_heartbeat(
-        leader_id=data.get('leader_id'),
-        term=data.get('term'),
-        leader_commit=data.get('leader_commit', -1)
-    )
-    
-    # Return log_length so leader knows if we need catch-up
-    return jsonify({
-        "success": True,
-        "node_id": raft.node_id,
-        "log_length": len(raft.local_log)
-    })
+    data = await _decode()
+    return _encode(await raft.handle_rpc(RPC_HEARTBEAT, data))
 
 
 @raft_bp.route('/rpc/commit', methods=['POST'])
 async def rpc_commit():
     """Receive commit notification from leader."""
     raft = get_raft_service()
-    data = await request.get_json()
-    
-    await raft.receive_commit(data.get('commit_index', -1))
-    
-    return jsonify({"success": True})
+    data = await _decode()
+    return _encode(await raft.handle_rpc(RPC_COMMIT, data))
 
 
 @raft_bp.route('/rpc/catch-up', methods=['POST'])
 async def rpc_catch_up():
     """Receive missing log entries from leader (log catch-up)."""
     raft = get_raft_service()
-    data = await request.get_json()
-    
-    success = await raft.receive_catch_up(
-        leader_id=data.get('leader_id'),
-        term=data.get('term', 0),
-        entries=data.get('entries', []),
-        leader_commit=data.get('leader_commit', -1)
-    )
-    
-    return jsonify({"success": success, "node_id": raft.node_id, "log_length": len(raft.local_log)})
+    data = await _decode()
+    return _encode(await raft.handle_rpc(RPC_CATCH_UP, data))
 
 
 @raft_bp.route('/rpc/promote', methods=['POST'])
 async def rpc_promote():
     """Receive promotion request - this node should become leader."""
     raft = get_raft_service()
-    data = await request.get_json()
-    
-    success = await raft.receive_promotion(
-        term=data.get('term', 0),
-        previous_leader=data.get('previous_leader', 0)
-    )
-    
-    return jsonify({"success": success, "node_id": raft.node_id})
+    data = await _decode()
+    return _encode(await raft.handle_rpc(RPC_PROMOTE, data))
 
 
 # =============================================================================
@@ -106,18 +120,25 @@ async def rpc_promote():
 async def get_status():
     """Get current node's Raft status."""
     raft = get_raft_service()
-    status = raft.get_status()
-    return jsonify(status.to_dict())
+    cached = _cached_response('status', raft.generation)
+    if cached:
+        return cached
+    
+    return _cache_response('status', raft.generation, raft.status_dict())
 
 
 @raft_bp.route('/leader', methods=['GET'])
 async def get_leader():
     """Get current leader information."""
     raft = get_raft_service()
-    return jsonify({
+    cached = _cached_response('leader', raft.generation)
+    if cached:
+        return cached
+    
+    return _cache_response('leader', raft.generation, {
         "leader_id": raft.leader_id,
         "this_node_id": raft.node_id,
-        "is_leader": raft.state.value == "leader"
+        "is_leader": raft.is_leader
     })
 
 
@@ -126,7 +147,7 @@ async def get_events():
     """Get recent Raft events."""
     raft = get_raft_service()
     events = raft.get_events(limit=50)
-    return jsonify({
+    return _json({
         "events": events,
         "count": len(events)
     })
@@ -136,36 +157,58 @@ async def get_events():
 async def get_log():
     """Get Raft log entries with replication status."""
     raft = get_raft_service()
-    log = raft.get_log()
+    generation = raft.generation
+    cached = _cached_response('log', generation)
+    if cached:
+        return cached
     
-    # Add replication status to each log entry
-    log_with_status = []
-    for entry in log:
-        entry_copy = entry.copy()
-        entry_copy['replication'] = raft.get_replication_status(entry['index'])
-        log_with_status.append(entry_copy)
-    
-    # Also get database raft logs
-    async with async_session() as session:
-        service = TaskService(session)
-        db_logs = await service.get_raft_logs(limit=50)
-    
-    return jsonify({
-        "memory_log": log_with_status,
-        "database_log": [l.to_dict() for l in db_logs],
-        "log_length": len(log),
-        "commit_index": raft.commit_index
-    })
+    log = raft.get_log()
+    commit_index = raft.commit_index
+    
+    # Also get database raft logs - from the leader's cache when it has them
+    db_logs = raft.get_recent_db_logs(limit=50)
+    if db_logs is None:
+        service = TaskService(get_read_session())
+        db_logs = await service.get_raft_logs(
+            limit=raft.recent_db_logs.maxlen if raft.is_leader else 50
+        )
+        raft.seed_db_logs(db_logs)
+        db_logs = db_logs[:50]
+    
+    async def generate():
+        """Stream the memory log entry by entry, then cache the full body."""
+        parts = [b'{"memory_log":[']
+        yield parts[-1]
+        
+        for i, entry in enumerate(log):
+            # Add replication status to each log entry (get_log builds fresh dicts);
+            # it is keyed by node id, which JSON needs as a string
+            entry['replication'] = raft.get_replication_status(entry['index'])
+            parts.append((b',' if i else b'') + orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS))
+            yield parts[-1]
+            
+        parts.append(
+            b'],"database_log":' + orjson.dumps(db_logs)
+            + b',"log_length":' + orjson.dumps(len(log))
+            + b',"commit_index":' + orjson.dumps(commit_index) + b'}'
+        )
+        yield parts[-1]
+        _store_response('log', generation, b''.join(parts))
+    
+    return Response(generate(), mimetype='application/json')
 
 
 @raft_bp.route('/cluster', methods=['GET'])
 async def get_cluster():
     """Get cluster overview - combines status of all nodes."""
     raft = get_raft_service()
+    cached = _cached_response('cluster', raft.generation)
+    if cached:
+        return cached
     
     # Return this node's view of the cluster
-    return jsonify({
-        "this_node": raft.get_status().to_dict(),
+    return _cache_response('cluster', raft.generation, {
+        "this_node": raft.status_dict(),
         "cluster_nodes": raft.cluster_nodes,
         "leader_id": raft.leader_id,
         "term": raft.term
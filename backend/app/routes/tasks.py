@@ -1,38 +1,61 @@
 """
 Task Routes - CRUD endpoints for tasks.
 """
-from quart import Blueprint, request, jsonify
-from ..database import async_session
+import orjson
+from functools import wraps
+from typing import Dict, Optional
+from quart import Blueprint, Response, request, jsonify
+from ..database import async_session, get_read_session
 from ..services.task_service import TaskService
 from ..services.raft_cluster import get_raft_service
 
 tasks_bp = Blueprint('tasks', __name__, url_prefix='/api/tasks')
 
+# Pre-serialized "not the leader" bodies, one per known leader_id
+_not_leader_bodies: Dict[Optional[int], bytes] = {}
+
+
+def leader_required(view):
+    """Reject writes on followers with a 307 pointing at the current leader."""
+    @wraps(view)
+    async def wrapper(*args, **kwargs):
+        raft = get_raft_service()
+        if not raft.is_leader:
+            body = _not_leader_bodies.get(raft.leader_id)
+            if body is None:
+                body = _not_leader_bodies[raft.leader_id] = orjson.dumps({
+                    "error": "Not the leader",
+                    "leader_id": raft.leader_id,
+                    "message": "Please send write requests to the leader node"
+                })
+            return Response(body, status=307, mimetype='application/json')
+        return await view(*args, **kwargs)
+    return wrapper
+
 
 @tasks_bp.route('', methods=['GET'])
 async def get_tasks():
     """Get all tasks."""
-    async with async_session() as session:
-        service = TaskService(session)
-        tasks = await service.get_all_tasks()
-        return jsonify({
-            "tasks": [t.to_dict() for t in tasks],
-            "count": len(tasks)
-        })
+    service = TaskService(get_read_session())
+    tasks = await service.get_all_tasks()
+    return jsonify({
+        "tasks": tasks,
+        "count": len(tasks)
+    })
 
 
 @tasks_bp.route('/<task_id>', methods=['GET'])
 async def get_task(task_id: str):
     """Get a specific task."""
-    async with async_session() as session:
-        service = TaskService(session)
-        task = await service.get_task(task_id)
-        if not task:
-            return jsonify({"error": "Task not found"}), 404
-        return jsonify(task.to_dict())
+    service = TaskService(get_read_session())
+    task = await service.get_task(task_id)
+    if not task:
+        return jsonify({"error": "Task not found"}), 404
+    return jsonify(task.to_dict())
 
 
 @tasks_bp.route('', methods=['POST'])
+@leader_required
 async def create_task():
     """Create a new task."""
     data = await request.get_json()
@@ -40,15 +63,6 @@ async def create_task():
     if not data or not data.get('title'):
         return jsonify({"error": "Title is required"}), 400
     
-    # Check if this node is the leader
-    raft = get_raft_service()
-    if raft.state.value != "leader":
-        return jsonify({
-            "error": "Not the leader",
-            "leader_id": raft.leader_id,
-            "message": "Please send write requests to the leader node"
-        }), 307
-    
     async with async_session() as session:
         service = TaskService(session)
         task = await service.create_task(
@@ -64,19 +78,11 @@ async def create_task():
 
 
 @tasks_bp.route('/<task_id>', methods=['PUT'])
+@leader_required
 async def update_task(task_id: str):
     """Update a task."""
     data = await request.get_json()
     
-    # Check if this node is the leader
-    raft = get_raft_service()
-    if raft.state.value != "leader":
-        return jsonify({
-            "error": "Not the leader",
-            "leader_id": raft.leader_id,
-            "message": "Please send write requests to the leader node"
-        }), 307
-    
     async with async_session() as session:
         service = TaskService(session)
         task = await service.update_task(
@@ -94,17 +100,9 @@ async def update_task(task_id: str):
 
 
 @tasks_bp.route('/<task_id>', methods=['DELETE'])
+@leader_required
 async def delete_task(task_id: str):
     """Delete a task."""
-    # Check if this node is the leader
-    raft = get_raft_service()
-    if raft.state.value != "leader":
-        return jsonify({
-            "error": "Not the leader",
-            "leader_id": raft.leader_id,
-            "message": "Please send write requests to the leader node"
-        }), 307
-    
     async with async_session() as session:
         service = TaskService(session)
         success = await service.delete_task(task_id)
@@ -0,0 +1,84 @@
+"""
+Raft Log Store - In-memory log kept as parallel arrays.
+Terms and timestamps live in typed arrays and keys/values in plain lists, so
+an entry costs a few machine words instead of a dict. Entry dicts are only
+built at the edges (RPC payloads, observability endpoints).
+"""
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+
+class LogStore:
+    """
+    Raft log where position == entry index.
+    Accepts and returns entries as {"index", "term", "key", "value", "timestamp"} dicts.
+    version changes on every mutation, so views derived from the log can be cached.
+    """
+
+    __slots__ = ("terms", "timestamps", "keys", "values", "version")
+
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()):
+        self.terms = array('q')
+        self.timestamps = array('d')
+        self.keys: List[Optional[str]] = []
+        self.values: List[Any] = []
+        self.version = 0
+        self.extend(entries)
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for index in range(len(self.terms)):
+            yield self.entry(index)
+
+    def append(self, entry: Dict[str, Any]):
+        self.terms.append(entry["term"])
+        self.timestamps.append(entry.get("timestamp", 0.0))
+        self.keys.append(entry.get("key"))
+        self.values.append(entry.get("value"))
+        self.version += 1
+
+    def extend(self, entries: Iterable[Dict[str, Any]]):
+        for entry in entries:
+            self.append(entry)
+
+    def truncate(self, start: int):
+        """Drop every entry from index start on."""
+        del self.terms[start:]
+        del self.timestamps[start:]
+        del self.keys[start:]
+        del self.values[start:]
+        self.version += 1
+
+    def term(self, index: int) -> int:
+        return self.terms[index]
+
+    def value(self, index: int) -> Any:
+        return self.values[index]
+
+    def entry(self, index: int) -> Dict[str, Any]:
+        """Build the dict form of a single entry."""
+        if index < 0:
+            index += len(self.terms)
+        return {
+            "index": index,
+            "term": self.terms[index],
+            "key": self.keys[index],
+            "value": self.values[index],
+            "timestamp": self.timestamps[index]
+        }
+
+    def entries(self, start: int = 0, stop: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Dict form of entries [start, stop) - slices each column once."""
+        start, stop, _ = slice(start, stop).indices(len(self.terms))
+        return [
+            {"index": index, "term": term, "key": key, "value": value, "timestamp": timestamp}
+            for index, term, key, value, timestamp in zip(
+                range(start, stop),
+                self.terms[start:stop],
+                self.keys[start:stop],
+                self.values[start:stop],
+                self.timestamps[start:stop]
+            )
+        ]
@@ -5,11 +5,26 @@ Each node maintains its own log and replicates via HTTP calls.
 import asyncio
 import time
 import random
+import collections
+import itertools
+import statistics
+import functools
 import aiohttp
-from typing import Optional, List, Dict, Any, Callable
+import msgpack
+import orjson
+from typing import Optional, List, Dict, Any, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from ..config import config
+from .log_writer import LogWriter
+from .log_store import LogStore
+from .raft_transport import (
+    PeerStream, HeartbeatProtocol, serve_peer, HEARTBEAT_DATAGRAM, HEARTBEAT, HEARTBEAT_ACK,
+    RPC_PATHS, MSGPACK_MIMETYPE,
+    RPC_APPEND_ENTRIES, RPC_HEARTBEAT, RPC_COMMIT, RPC_CATCH_UP, RPC_PROMOTE
+)
+
 
 class NodeState(str, Enum):
     FOLLOWER = "follower"
@@ -64,16 +79,59 @@ class NodeStatus:
         }
 
 
+@functools.lru_cache(maxsize=None)
+def client_timeout(total: float) -> aiohttp.ClientTimeout:
+    """Shared ClientTimeout per duration (they're immutable, no need to rebuild per RPC)."""
+    return aiohttp.ClientTimeout(total=total)
+
+
+# Keys ending in this mark a deletion of the key they extend (task:{id}:deleted)
+DELETED_SUFFIX = ":deleted"
+
+
+def limit_batch_size(entries: List[Dict[str, Any]], max_bytes: int) -> int:
+    """
+    Number of leading entries whose encoded size fits in max_bytes.
+    Always at least one, so an oversized entry still gets sent on its own.
+    """
+    total = 0
+    for count, entry in enumerate(entries):
+        total += len(msgpack.packb(entry, use_bin_type=True))
+        if total > max_bytes and count > 0:
+            return count
+    return len(entries)
+
+
 class RaftClusterService:
     """
     Real Raft cluster with network-based log replication.
     Each node maintains its own log and communicates via HTTP.
     """
     
+    RPC_HEADERS = {"Content-Type": MSGPACK_MIMETYPE}
+    # Used until enough heartbeats have been seen to measure the link
+    DEFAULT_ELECTION_TIMEOUT = 5.0
+    
     def __init__(self, node_id: int, cluster_nodes: List[str]):
         self.node_id = node_id
         self.cluster_nodes = cluster_nodes  # ['127.0.0.1:9001', ...]
-        self.http_ports = {1: 8001, 2: 8002, 3: 8003}
+        
+        # Membership comes from cluster_nodes: node N is the Nth address
+        self.cluster_ids: Tuple[int, ...] = tuple(range(1, len(cluster_nodes) + 1))
+        self.follower_ids: Tuple[int, ...] = tuple(i for i in self.cluster_ids if i != node_id)
+        self.raft_ports = {
+            i: int(address.rsplit(':', 1)[1]) for i, address in zip(self.cluster_ids, cluster_nodes)
+        }
+        self.http_ports = {i: config.NODE_PORTS[i] for i in self.cluster_ids}
+        
+        # Peer RPC endpoints, built once: node_id -> rpc -> HTTP fallback URL
+        self.rpc_urls: Dict[int, Dict[str, str]] = {
+            peer: {
+                rpc: f"http://127.0.0.1:{self.http_ports[peer]}/api/raft/rpc/{path}"
+                for rpc, path in RPC_PATHS.items()
+            }
+            for peer in self.follower_ids
+        }
         
         # Raft state
         self.state = NodeState.FOLLOWER
@@ -81,32 +139,153 @@ class RaftClusterService:
         self.voted_for: Optional[int] = None
         self.leader_id: Optional[int] = None
         
-        # Each node has its OWN local log (not shared!)
-        self.local_log: List[Dict[str, Any]] = []
+        # Each node has its OWN local log (not shared!), persisted on disk
+        # together with the term and vote, so a restart can't go back in time
+        self.log_writer = LogWriter(f'./raft_logs/node_{node_id}/raft.log')
+        entries, hard_state = LogWriter.load(self.log_writer.path)
+        self.local_log = LogStore(entries)
+        self.term = hard_state.get("term", 0)
+        self.voted_for = hard_state.get("voted_for")
+        self.persisted_hard_state = (self.term, self.voted_for)
+        self.kv_index: Dict[str, int] = {}  # key -> index of its latest entry
+        self._log_message_cache: Tuple[int, str] = (-1, "")  # (log version, serialized log message)
+        # Status dict and its serialized WebSocket message, keyed by the fields they show
+        self._status_cache: Tuple[Optional[tuple], Dict[str, Any], Optional[str]] = (None, {}, None)
+        self._index_entries(self.local_log)
         self.commit_index = -1
-        self.last_heartbeat = time.time()
+        # Follower side: highest index a successful AppendEntries proved matches
+        # the leader of confirmed_term. Heartbeats never commit past it.
+        self.confirmed_index = -1
+        self.confirmed_term: Optional[int] = None
+        # Timers use the monotonic clock (immune to NTP/wall-clock jumps); the
+        # offset converts to wall-clock time only for display
+        self.last_heartbeat = time.monotonic()
+        self.wall_clock_offset = time.time() - time.monotonic()
+        
+        # Failure detection: the election timeout follows the observed gaps
+        # between leader messages (mean + 4 stdev), randomized in [E, 2E] so
+        # followers don't all time out together
+        self.heartbeat_gaps: collections.deque = collections.deque(maxlen=32)
+        self.last_leader_contact: Optional[float] = None  # monotonic
+        self.election_timeout = self.DEFAULT_ELECTION_TIMEOUT
+        self.election_jitter = random.uniform(1, 2)
+        
+        # Demo only: randomly hand leadership to another node now and then
+        self.demo_mode = config.RAFT_DEMO_CHURN
+        
+        # Replication progress: highest index known to be on each follower, and
+        # on our own disk. Commit advances to the index a majority has reached.
+        self.match_index: Dict[int, int] = {}  # node_id -> highest replicated log_index
+        self.durable_index = len(self.local_log) - 1
         
-        # Tracking replication status per entry
-        self.replication_acks: Dict[int, set] = {}  # log_index -> set of node_ids that acked
+        # Leader heartbeat period; an AppendEntries sent within it doubles as the heartbeat
+        self.heartbeat_interval = 0.5
+        self.last_append_sent: Dict[int, float] = {}  # node_id -> time of last AppendEntries
+        # Without UDP, each follower gets one long-lived RPC heartbeat sender
+        self.heartbeat_wakeups: Dict[int, asyncio.Event] = {}
+        self.heartbeats_in_flight: set = set()  # followers with an RPC heartbeat still unanswered
+        # (term, commit_index, log_length) -> heartbeat datagram; unchanged while idle
+        self._heartbeat_cache: Tuple[Optional[tuple], bytes] = (None, b'')
+        
+        # Per-follower replication pipeline: entries queue up while the follower
+        # already has max_in_flight AppendEntries outstanding, then ship as one batch
+        self.max_in_flight = config.RAFT_MAX_IN_FLIGHT
+        self.max_append_bytes = config.RAFT_MAX_APPEND_BYTES
+        self.catch_up_chunk_entries = config.RAFT_CATCH_UP_CHUNK_ENTRIES
+        self.catching_up: set = set()  # followers with a catch-up stream running
+        
+        # Client writes wait here as (key, value, future) until the batcher
+        # appends them - everything queued at that moment goes out together
+        self.max_write_batch = config.RAFT_MAX_WRITE_BATCH
+        self.write_queue: asyncio.Queue = asyncio.Queue()
+        self.pending_entries: Dict[int, List[Dict[str, Any]]] = {}
+        self.replicator_wakeups: Dict[int, asyncio.Event] = {}
+        self.commit_waiters: Dict[int, asyncio.Future] = {}  # log_index -> resolves True/False
+        self.replication_failures: Dict[int, int] = {}  # log_index -> bitmask of node_ids that failed
         
         # Event tracking for observability
-        self.events: List[RaftEvent] = []
         self.max_events = 100
+        self.events: collections.deque = collections.deque(maxlen=self.max_events)
+        self.generation = 0  # Bumped on every event so cached views can be invalidated
+        
+        # Newest-first cache of committed raft_log rows (as dicts), so /log can
+        # skip MySQL. Only the leader writes those rows, so the cache is only
+        # authoritative while we lead the term it was seeded in.
+        self.recent_db_logs: collections.deque = collections.deque(maxlen=256)
+        self.recent_db_logs_term: Optional[int] = None
         
         # WebSocket subscribers
         self.subscribers: List[Callable] = []
         
+        # Shared keep-alive HTTP client for all peer traffic (opened in start())
+        self.session: Optional[aiohttp.ClientSession] = None
+        
+        # Persistent RPC streams to peers (node_id -> stream), served on our Raft port
+        self.peer_streams: Dict[int, PeerStream] = {}
+        self.rpc_server: Optional[asyncio.AbstractServer] = None
+        
+        # UDP heartbeats (falls back to the RPC heartbeat if the socket can't open)
+        self.heartbeat_transport: Optional[asyncio.DatagramTransport] = None
+        
         self.running = False
         
+    @property
+    def is_leader(self) -> bool:
+        return self.state is NodeState.LEADER
+        
     async def start(self):
         """Start the Raft node."""
         self.running = True
         self.state = NodeState.FOLLOWER
         self._add_event("node_started", {})
+        await self.log_writer.start()
         
         print(f"Node {self.node_id} started on port {self.http_ports[self.node_id]}")
         print(f"Raft cluster: {self.cluster_nodes}")
         
+        # Peer RPCs: one long-lived TCP stream per peer, pooled HTTP as the fallback
+        try:
+            self.rpc_server = await asyncio.start_server(
+                lambda reader, writer: serve_peer(reader, writer, self.handle_rpc),
+                '127.0.0.1', self.raft_ports[self.node_id], reuse_address=True
+            )
+        except OSError as e:
+            print(f"⚠️  Node {self.node_id}: Raft port unavailable ({e}), peers will use HTTP")
+        self.peer_streams = {
+            node_id: PeerStream('127.0.0.1', self.raft_ports[node_id])
+            for node_id in self.follower_ids
+        }
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=64, limit_per_host=16, keepalive_timeout=30, enable_cleanup_closed=True
+            ),
+            timeout=client_timeout(2),
+            json_serialize=lambda obj: orjson.dumps(obj).decode()
+        )
+        
+        try:
+            self.heartbeat_transport, _ = await asyncio.get_running_loop().create_datagram_endpoint(
+                lambda: HeartbeatProtocol(self._on_heartbeat_datagram),
+                local_addr=('127.0.0.1', self._heartbeat_port(self.node_id))
+            )
+        except OSError as e:
+            print(f"⚠️  Node {self.node_id}: UDP heartbeats unavailable ({e}), using RPC heartbeats")
+        
+        # One replicator per follower
+        for node_id in self.follower_ids:
+            self.pending_entries[node_id] = []
+            self.replicator_wakeups[node_id] = asyncio.Event()
+            asyncio.create_task(self._replicator_loop(node_id))
+            
+        self.heartbeat_wakeups = {}
+        if self.heartbeat_transport is None:
+            for node_id in self.follower_ids:
+                self.heartbeat_wakeups[node_id] = asyncio.Event()
+                asyncio.create_task(self._heartbeat_sender(node_id))
+        
+        self.write_queue = asyncio.Queue()
+        asyncio.create_task(self._batcher_loop(self.write_queue))
+        
         # Start election process
         asyncio.create_task(self._election_loop())
         asyncio.create_task(self._heartbeat_loop())
@@ -116,9 +295,63 @@ class RaftClusterService:
         self.running = False
         old_state = self.state
         self.state = NodeState.STOPPED
+        self._abandon_replication()
         self._add_event("node_stopped", {"old_state": old_state.value})
         await self._notify_subscribers()
         
+        for stream in self.peer_streams.values():
+            await stream.close()
+        self.peer_streams = {}
+        
+        if self.rpc_server is not None:
+            self.rpc_server.close()
+            self.rpc_server = None
+        
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+        
+        if self.heartbeat_transport is not None:
+            self.heartbeat_transport.close()
+            self.heartbeat_transport = None
+        
+        # Wake replicators, heartbeat senders and the batcher so they see we're stopped and exit
+        for wakeup in itertools.chain(self.replicator_wakeups.values(), self.heartbeat_wakeups.values()):
+            wakeup.set()
+        self.write_queue.put_nowait(None)
+        
+    async def _call_peer(self, target_node: int, rpc: str, payload: Dict[str, Any],
+                         timeout: float = 2) -> Optional[Dict[str, Any]]:
+        """
+        Send an RPC to a peer over its persistent stream.
+        Falls back to a plain HTTP POST only if the stream can't connect; a
+        request that was sent but timed out is not resent.
+        Returns the peer's response, or None if the peer is unreachable.
+        """
+        stream = self.peer_streams.get(target_node)
+        if stream is not None:
+            try:
+                await stream.connect()
+            except (OSError, asyncio.TimeoutError):
+                pass  # Fall back to HTTP below
+            else:
+                try:
+                    return await stream.request(rpc, payload, timeout)
+                except (asyncio.TimeoutError, ConnectionError):
+                    return None
+                
+        if self.session is None:
+            return None
+        async with self.session.post(
+            self.rpc_urls[target_node][rpc],
+            data=msgpack.packb(payload, use_bin_type=True),
+            headers=self.RPC_HEADERS,
+            timeout=client_timeout(timeout)
+        ) as resp:
+            if resp.status == 200:
+                return msgpack.unpackb(await resp.read(), raw=False)
+        return None
+        
     async def _election_loop(self):
         """Handle leader election and failure detection."""
         await asyncio.sleep(2)  # Initial wait
@@ -128,24 +361,44 @@ class RaftClusterService:
             await self._become_leader()
         
         # Monitor for leader failure and trigger elections
-        election_timeout = 5.0  # 5 seconds without heartbeat = leader is dead
-        
         while self.running:
-            await asyncio.sleep(1)  # Check every second
+            await asyncio.sleep(0.1)
             
-            if self.state == NodeState.FOLLOWER:
+            if self.state is NodeState.FOLLOWER:
                 # Check if we haven't heard from leader in a while
-                time_since_heartbeat = time.time() - self.last_heartbeat
+                self.election_timeout = self._measure_election_timeout()
+                time_since_heartbeat = time.monotonic() - self.last_heartbeat
                 
-                if time_since_heartbeat > election_timeout:
+                if time_since_heartbeat > self.election_timeout * self.election_jitter:
                     print(f"⚠️  Node {self.node_id}: No heartbeat for {time_since_heartbeat:.1f}s, starting election!")
                     await self._start_election()
                     
-            elif self.state == NodeState.LEADER:
-                # Simulate occasional leadership changes for demo (less frequent now)
-                if random.random() < 0.01:  # 1% chance per second
+            elif self.state is NodeState.LEADER and self.demo_mode:
+                # Simulate occasional leadership changes for demo, but never
+                # while entries are still waiting to commit
+                uncommitted = len(self.local_log) - 1 - self.commit_index
+                if uncommitted == 0 and random.random() < 0.001:  # ~1% chance per second
                     await self._trigger_election()
                     
+    def _record_leader_contact(self):
+        """Reset the election timer and sample the gap since the leader's last message."""
+        now = time.monotonic()
+        self.last_heartbeat = now
+        if self.last_leader_contact is not None:
+            self.heartbeat_gaps.append(now - self.last_leader_contact)
+        self.last_leader_contact = now
+        self.election_jitter = random.uniform(1, 2)
+        
+    def _measure_election_timeout(self) -> float:
+        """Election timeout from heartbeat gaps: mean + 4 stdev, never below the floor."""
+        if len(self.heartbeat_gaps) < 2:
+            return self.DEFAULT_ELECTION_TIMEOUT
+        mean = statistics.fmean(self.heartbeat_gaps)
+        stdev = statistics.stdev(self.heartbeat_gaps)
+        # A single delayed heartbeat must not look like a dead leader
+        floor = max(config.ELECTION_TIMEOUT_MIN, 2 * self.heartbeat_interval)
+        return max(floor, mean + 4 * stdev)
+        
     async def _start_election(self):
         """Start an election when leader failure is detected."""
         # Become candidate
@@ -153,6 +406,7 @@ class RaftClusterService:
         self.state = NodeState.CANDIDATE
         self.term += 1
         self.voted_for = self.node_id
+        await self._persist([])
         
         print(f"🗳️  Node {self.node_id} starting election for term {self.term}")
         
@@ -166,15 +420,18 @@ class RaftClusterService:
         # For simplicity, we'll just become leader if we're the first to notice
         await asyncio.sleep(0.5)  # Brief delay
         
-        if self.state == NodeState.CANDIDATE:
+        if self.state is NodeState.CANDIDATE:
             await self._become_leader()
                     
     async def _become_leader(self):
         """This node becomes the leader."""
         self.term += 1
+        self.voted_for = self.node_id
+        await self._persist([])
         old_state = self.state
         self.state = NodeState.LEADER
         self.leader_id = self.node_id
+        self.match_index = {}  # Unknown until followers ack in this term
         
         print(f"🎯 Node {self.node_id} became LEADER for term {self.term}")
         
@@ -189,10 +446,12 @@ class RaftClusterService:
         
     async def _trigger_election(self):
         """Trigger a new election (for demo) - notifies new leader via HTTP."""
-        running_nodes = [1, 2, 3]
+        running_nodes = self.cluster_ids
         new_leader = random.choice(running_nodes)
         
         self.term += 1
+        self.voted_for = new_leader
+        await self._persist([])
         print(f"🗳️  Election: Term {self.term}, New leader requested: Node {new_leader}")
         
         if new_leader == self.node_id:
@@ -208,6 +467,7 @@ class RaftClusterService:
             old_state = self.state
             self.state = NodeState.FOLLOWER
             self.leader_id = new_leader
+            self._abandon_replication()
             
             self._add_event("state_change", {
                 "old_state": old_state.value,
@@ -216,14 +476,12 @@ class RaftClusterService:
             })
             await self._notify_subscribers()
             
-            # Send HTTP request to new leader to become leader
+            # Ask the new leader to take over
             try:
-                url = f"http://127.0.0.1:{self.http_ports[new_leader]}/api/raft/rpc/promote"
-                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2)) as session:
-                    await session.post(url, json={
-                        "term": self.term,
-                        "previous_leader": self.node_id
-                    })
+                await self._call_peer(new_leader, RPC_PROMOTE, {
+                    "term": self.term,
+                    "previous_leader": self.node_id
+                })
                 print(f"  → Notified Node {new_leader} to become leader")
             except Exception as e:
                 print(f"  ✗ Failed to notify Node {new_leader}: {e}")
@@ -231,204 +489,568 @@ class RaftClusterService:
     async def _heartbeat_loop(self):
         """Send periodic heartbeats if leader."""
         while True:
-            await asyncio.sleep(0.5)
+            await asyncio.sleep(self.heartbeat_interval)
             
             # Only leader sends heartbeats and updates its own timer
-            if self.state == NodeState.LEADER and self.running:
-                self.last_heartbeat = time.time()  # Leader is always "alive"
+            if self.state is NodeState.LEADER and self.running:
+                self.last_heartbeat = time.monotonic()  # Leader is always "alive"
                 await self._send_heartbeat_to_all()
                 
     async def _send_heartbeat_to_all(self):
-        """Leader sends heartbeat with current state to all followers."""
-        for node_id in [1, 2, 3]:
-            if node_id != self.node_id:
-                asyncio.create_task(self._send_heartbeat(node_id))
+        """
+        Leader sends heartbeat with current state to all followers.
+        Followers that got an AppendEntries this period are skipped - its
+        response already carried their log_length and commit_index.
+        """
+        now = time.monotonic()
+        due = [
+            node_id for node_id in self.follower_ids
+            if now - self.last_append_sent.get(node_id, 0) >= self.heartbeat_interval
+        ]
+        # UDP sends don't block, so they need no task or await at all
+        if self.heartbeat_transport is not None:
+            datagram = self._heartbeat_datagram()
+            for node_id in due:
+                self.heartbeat_transport.sendto(datagram, ('127.0.0.1', self._heartbeat_port(node_id)))
+            return
+        # RPC heartbeats: just wake each follower's sender, so a hung peer can't
+        # stretch the period; one whose last heartbeat is unanswered is skipped
+        for node_id in due:
+            wakeup = self.heartbeat_wakeups.get(node_id)
+            if wakeup is not None and node_id not in self.heartbeats_in_flight:
+                wakeup.set()
                 
-    async def _send_heartbeat(self, target_node: int):
-        """Send heartbeat to a specific node."""
-        try:
-            url = f"http://127.0.0.1:{self.http_ports[target_node]}/api/raft/rpc/heartbeat"
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1)) as session:
-                async with session.post(url, json={
-                    "leader_id": self.node_id,
-                    "term": self.term,
-                    "leader_commit": self.commit_index,
-                    "leader_log_length": len(self.local_log)  # For log catch-up
-                }) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        # Check if follower needs catch-up
-                        follower_log_length = data.get("log_length", 0)
-                        if follower_log_length < len(self.local_log):
-                            # Send missing entries
-                            asyncio.create_task(self._send_missing_entries(target_node, follower_log_length))
-        except Exception:
-            pass  # Node might be down
-            
-    async def replicate_data(self, key: str, value: Any) -> bool:
+    def _heartbeat_port(self, node_id: int) -> int:
+        return self.raft_ports[node_id] + config.HEARTBEAT_PORT_OFFSET
+        
+    def _heartbeat_datagram(self) -> bytes:
+        """Heartbeat datagram, rebuilt only when its contents change."""
+        signature = (self.term, self.commit_index, len(self.local_log))
+        if self._heartbeat_cache[0] != signature:
+            self._heartbeat_cache = (signature, HEARTBEAT_DATAGRAM.pack(HEARTBEAT, self.node_id, *signature))
+        return self._heartbeat_cache[1]
+        
+    async def _heartbeat_sender(self, target_node: int):
+        """
+        RPC heartbeats for when UDP is unavailable: an empty AppendEntries (which
+        also triggers catch-up if the follower is behind) per wakeup, given at
+        most one heartbeat period. Like the datagram it carries the leader's
+        commit index, so commits need no message of their own.
+        """
+        wakeup = self.heartbeat_wakeups[target_node]
+        while self.running:
+            await wakeup.wait()
+            wakeup.clear()
+            if not self.running or self.state is not NodeState.LEADER:
+                continue
+            self.heartbeats_in_flight.add(target_node)
+            try:
+                await self._send_append_entries(target_node, [], timeout=self.heartbeat_interval)
+            finally:
+                self.heartbeats_in_flight.discard(target_node)
+            
+    async def replicate_data(self, key: str, value: Any) -> Optional[int]:
         """
         Replicate data across the cluster (leader only).
         This is the REAL Raft AppendEntries flow!
+        The write is queued for the batcher; returns the entry's log index once
+        it is committed, or None if it wasn't.
         """
-        if self.state != NodeState.LEADER:
+        if self.state is not NodeState.LEADER:
             print(f"⚠️  Node {self.node_id} is not leader, cannot replicate")
-            return False
+            return None
             
-        # 1. Append to LOCAL log first
-        log_index = len(self.local_log)
-        log_entry = {
-            "index": log_index,
-            "term": self.term,
-            "key": key,
-            "value": value,
-            "timestamp": time.time()
-        }
-        self.local_log.append(log_entry)
-        
-        # Initialize acks - leader counts as one ack
-        self.replication_acks[log_index] = {self.node_id}
+        future = asyncio.get_running_loop().create_future()
+        self.write_queue.put_nowait((key, value, future))
+        return await future
         
-        print(f"📝 Leader appended to local log: {key} at index {log_index}")
-        
-        self._add_event("log_append", {"key": key, "index": log_index})
+    async def _batcher_loop(self, write_queue: asyncio.Queue):
+        """
+        Append queued client writes to the log in batches.
+        Doesn't wait for a batch to fill - whatever is queued when the
+        previous batch was handed off goes out next, up to max_write_batch.
+        """
+        while True:
+            writes = [await write_queue.get()]
+            while len(writes) < self.max_write_batch and not write_queue.empty():
+                writes.append(write_queue.get_nowait())
+                
+            stopped = None in writes
+            writes = [write for write in writes if write is not None]
+            if self.state is not NodeState.LEADER:
+                for _, _, future in writes:
+                    if not future.done():
+                        future.set_result(None)
+            elif writes:
+                self._append_batch(writes)
+            if stopped:
+                return
+                
+    def _append_batch(self, writes: List[Tuple[str, Any, asyncio.Future]]):
+        """Append a batch to the local log and hand it to every follower's replicator."""
+        # 1. Append to LOCAL log first
+        first_index = len(self.local_log)
+        now = time.time()
+        entries = [
+            {
+                "index": first_index + i,
+                "term": self.term,
+                "key": key,
+                "value": value,
+                "timestamp": now
+            }
+            for i, (key, value, _) in enumerate(writes)
+        ]
+        self.local_log.extend(entries)
+        self._index_entries(entries)
+        # Leader's own fsync overlaps with replication to followers; it counts
+        # towards the majority once it's on disk
+        persisted = asyncio.ensure_future(self._persist(entries))
+        persisted.add_done_callback(lambda _: self._advance_commit())
         
-        # 2. Send to ALL followers via HTTP
-        ack_count = 1  # Leader already has it
+        loop = asyncio.get_running_loop()
+        waiters = []
+        for entry in entries:
+            waiter = loop.create_future()
+            self.commit_waiters[entry["index"]] = waiter
+            waiters.append(waiter)
+            print(f"📝 Leader appended to local log: {entry['key']} at index {entry['index']}")
+            self._add_event("log_append", {"key": entry["key"], "index": entry["index"]})
+            
+        # 2. Hand to every follower's replicator
+        for node_id in self.pending_entries:
+            self.pending_entries[node_id].extend(entries)
+            self.replicator_wakeups[node_id].set()
+            
+        asyncio.create_task(self._await_batch_commit(entries, waiters, persisted,
+                                                     [future for _, _, future in writes]))
         
-        for node_id in [1, 2, 3]:
-            if node_id != self.node_id:
-                success = await self._send_append_entries(node_id, log_entry)
-                if success:
-                    ack_count += 1
-                    self.replication_acks[log_index].add(node_id)
-                    print(f"  ✓ Node {node_id} acknowledged")
-                else:
-                    print(f"  ✗ Node {node_id} failed to acknowledge")
+    async def _await_batch_commit(self, entries: List[Dict[str, Any]], waiters: List[asyncio.Future],
+                                  persisted: asyncio.Future, futures: List[asyncio.Future]):
+        """Wait for a majority on each entry of a batch, then release its writers."""
+        await asyncio.wait(waiters, timeout=5)
+        for entry in entries:
+            self.commit_waiters.pop(entry["index"], None)
+            self.replication_failures.pop(entry["index"], None)
+            
+        try:
+            await persisted
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+            
+        # 3. Check if majority (2 out of 3) acknowledged each entry
+        results = [waiter.done() and waiter.result() for waiter in waiters]
+        for entry, committed in zip(entries, results):
+            log_index = entry["index"]
+            ack_count = self._ack_count(log_index)
+            if committed:
+                print(f"✅ Entry {log_index} COMMITTED (acks: {ack_count}/{len(self.cluster_ids)})")
+                self._add_event("log_commit", {"index": log_index, "acks": ack_count})
+            else:
+                print(f"❌ Entry {log_index} NOT committed (acks: {ack_count}/{len(self.cluster_ids)})")
+                
+        for entry, future, committed in zip(entries, futures, results):
+            if not future.done():
+                future.set_result(entry["index"] if committed else None)
+                
+        if any(results):
+            # Followers learn the new commit index from the next AppendEntries/heartbeat
+            await self._notify_subscribers()
+            
+    async def _replicator_loop(self, target_node: int):
+        """
+        Ship pending entries to one follower.
+        At most max_in_flight AppendEntries are outstanding; while all slots
+        are busy new entries accumulate and go out together once one frees.
+        """
+        wakeup = self.replicator_wakeups[target_node]
+        in_flight = asyncio.Semaphore(self.max_in_flight)
         
-        # 3. Check if majority (2 out of 3) acknowledged
-        if ack_count >= 2:
-            self.commit_index = log_index
-            print(f"✅ Entry {log_index} COMMITTED (acks: {ack_count}/3)")
+        while self.running:
+            await wakeup.wait()
+            wakeup.clear()
+            if self.state is not NodeState.LEADER:
+                self._abandon_replication()
+                continue
+            if not self.pending_entries.get(target_node):
+                continue
+                
+            await in_flight.acquire()
+            pending = self.pending_entries.get(target_node)
+            if not pending or not self.running or self.state is not NodeState.LEADER:
+                in_flight.release()
+                continue
+                
+            # Cap the RPC by size; leftovers go in the next batch
+            count = limit_batch_size(pending, self.max_append_bytes)
+            batch, self.pending_entries[target_node] = pending[:count], pending[count:]
+            if self.pending_entries[target_node]:
+                wakeup.set()
+            asyncio.create_task(self._ship_batch(target_node, batch, in_flight))
             
-            self._add_event("log_commit", {"index": log_index, "acks": ack_count})
+    async def _ship_batch(self, target_node: int, batch: List[Dict], in_flight: asyncio.Semaphore):
+        """
+        Send one batch and record the follower's ack for each entry in it.
+        The batch goes out under the term it was appended in; if we have
+        moved on to a newer term since, it is dropped (catch-up resends it).
+        """
+        term = batch[0]["term"]
+        try:
+            if self.state is not NodeState.LEADER or self.term != term:
+                return
+            success = await self._send_append_entries(target_node, batch, term)
+            if self.state is NodeState.LEADER and self.term == term:
+                self._record_acks(target_node, [entry["index"] for entry in batch], success)
+        finally:
+            in_flight.release()
             
-            # Notify followers to commit
-            await self._send_commit_notification(log_index)
+    def _abandon_replication(self):
+        """Drop queued entries and fail uncommitted writes once we stop leading."""
+        for pending in self.pending_entries.values():
+            pending.clear()
+        for waiter in self.commit_waiters.values():
+            if not waiter.done():
+                waiter.set_result(False)
+                
+    async def _step_down(self, term: int):
+        """A peer answered with a newer term: adopt it and stop leading."""
+        if term <= self.term:
+            return
+        self.term = term
+        self.voted_for = None
+        self.leader_id = None
+        await self._persist([])
+        if self.state is NodeState.LEADER or self.state is NodeState.CANDIDATE:
+            old_state = self.state
+            self.state = NodeState.FOLLOWER
+            self._abandon_replication()
+            print(f"⬇️  Node {self.node_id} stepping down, saw term {term}")
+            self._add_event("state_change", {
+                "old_state": old_state.value,
+                "new_state": "follower",
+                "term": term
+            })
             await self._notify_subscribers()
-            return True
+            
+    def _record_acks(self, target_node: int, indexes: List[int], success: bool):
+        """Record a follower's (n)ack for entries and resolve any commit waiters."""
+        if success:
+            print(f"  ✓ Node {target_node} acknowledged {len(indexes)} entries")
         else:
-            print(f"❌ Entry {log_index} NOT committed (acks: {ack_count}/3)")
-            return False
+            print(f"  ✗ Node {target_node} failed to acknowledge {len(indexes)} entries")
             
-    async def _send_append_entries(self, target_node: int, entry: Dict) -> bool:
-        """Send AppendEntries RPC to a follower."""
-        try:
-            url = f"http://127.0.0.1:{self.http_ports[target_node]}/api/raft/rpc/append-entries"
+        if success:
+            # Acks can arrive out of order - never move match_index backwards
+            self.match_index[target_node] = max(self.match_index.get(target_node, -1), max(indexes))
+            self._advance_commit()
+            return
             
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=2)) as session:
-                async with session.post(url, json={
-                    "leader_id": self.node_id,
-                    "term": self.term,
-                    "entry": entry
-                }) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        return data.get("success", False)
+        cluster_size = len(self.cluster_ids)
+        for index in indexes:
+            failures = self.replication_failures.get(index, 0) | 1 << (target_node - 1)
+            self.replication_failures[index] = failures
+            waiter = self.commit_waiters.get(index)
+            if (waiter is not None and not waiter.done()
+                    and cluster_size - bin(failures).count("1") <= cluster_size // 2):
+                # Not enough nodes left that could still ack
+                waiter.set_result(False)
+                
+    def _advance_commit(self):
+        """Commit up to the highest index a majority holds and release its waiters."""
+        if self.state is not NodeState.LEADER:
+            return
+        matches = sorted(
+            [self.durable_index] + [self.match_index.get(peer, -1) for peer in self.follower_ids],
+            reverse=True
+        )
+        majority_index = matches[len(matches) // 2]
+        # Only entries from our own term are committed by counting replicas
+        if majority_index <= self.commit_index or self.local_log.term(majority_index) != self.term:
+            return
+        self.commit_index = majority_index
+        
+        for index, waiter in self.commit_waiters.items():
+            if index <= majority_index and not waiter.done():
+                waiter.set_result(True)
+                
+    def _ack_count(self, log_index: int) -> int:
+        """Number of nodes (including us) known to hold an entry."""
+        return sum(self.get_replication_status(log_index).values())
+        
+
+    async def _send_append_entries(self, target_node: int, entries: List[Dict],
+                                   term: Optional[int] = None, timeout: float = 2) -> bool:
+        """
+        Send a batch of entries to a follower in a single AppendEntries RPC,
+        stamped with `term` (the current term if not given).
+        """
+        term = self.term if term is None else term
+        prev_log_index = entries[0]["index"] - 1 if entries else len(self.local_log) - 1
+        prev_log_term = self.local_log.term(prev_log_index) if prev_log_index >= 0 else None
+        
+        try:
+            self.last_append_sent[target_node] = time.monotonic()
+            data = await self._call_peer(target_node, RPC_APPEND_ENTRIES, {
+                "leader_id": self.node_id,
+                "term": term,
+                "prev_log_index": prev_log_index,
+                "prev_log_term": prev_log_term,
+                "leader_commit": self.commit_index,
+                "entries": entries
+            }, timeout=timeout)
+            if data is not None:
+                if data.get("term", 0) > self.term:
+                    await self._step_down(data["term"])
+                    return False
+                # The response doubles as a heartbeat ack - catch the follower up if it's behind or diverged
+                if not data.get("success"):
+                    asyncio.create_task(self._send_missing_entries(target_node, data.get("log_length", 0)))
+                return data.get("success", False)
         except Exception as e:
             print(f"  RPC to Node {target_node} failed: {e}")
         return False
         
-    async def _send_commit_notification(self, commit_index: int):
-        """Notify followers that an entry was committed."""
-        for node_id in [1, 2, 3]:
-            if node_id != self.node_id:
-                try:
-                    url = f"http://127.0.0.1:{self.http_ports[node_id]}/api/raft/rpc/commit"
-                    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=1)) as session:
-                        await session.post(url, json={"commit_index": commit_index})
-                except Exception:
-                    pass
-                    
     async def _send_missing_entries(self, target_node: int, follower_log_length: int):
-        """Send missing log entries to a follower that's behind (log catch-up)."""
-        if follower_log_length >= len(self.local_log):
-            return  # No catch-up needed
+        """
+        Send missing log entries to a follower that's behind or has diverged (log catch-up).
+        Entries go out in bounded chunks over the peer stream; each chunk is
+        acked before the next is sent, so neither side buffers the whole gap.
+        A chunk is checked against the follower's log like AppendEntries; on a
+        mismatch we walk back until the logs agree and overwrite from there.
+        """
+        if not self.local_log:
+            return  # Nothing to send
+        if target_node in self.catching_up:
+            return  # Already streaming entries to this follower
             
-        missing_entries = self.local_log[follower_log_length:]
-        
-        print(f"📤 Sending {len(missing_entries)} missing entries to Node {target_node} (has {follower_log_length}, leader has {len(self.local_log)})")
+        # Resend at least our last entry, so a log of the same length but a
+        # different history still gets compared
+        next_index = min(follower_log_length, len(self.local_log) - 1)
+        term = self.term
+        print(f"📤 Sending {len(self.local_log) - next_index} missing entries to Node {target_node} (has {follower_log_length}, leader has {len(self.local_log)})")
         
+        self.catching_up.add(target_node)
         try:
-            url = f"http://127.0.0.1:{self.http_ports[target_node]}/api/raft/rpc/catch-up"
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                async with session.post(url, json={
+            while (next_index < len(self.local_log) and self.state is NodeState.LEADER
+                   and self.term == term):
+                chunk = self._catch_up_chunk(next_index)
+                prev_log_index = next_index - 1
+                data = await self._call_peer(target_node, RPC_CATCH_UP, {
                     "leader_id": self.node_id,
-                    "term": self.term,
-                    "entries": missing_entries,
+                    "term": term,
+                    "prev_log_index": prev_log_index,
+                    "prev_log_term": self.local_log.term(prev_log_index) if prev_log_index >= 0 else None,
+                    "entries": chunk,
                     "leader_commit": self.commit_index
-                }) as resp:
-                    if resp.status == 200:
-                        print(f"  ✓ Node {target_node} caught up!")
+                }, timeout=5)
+                if data is None:
+                    print(f"  ✗ Catch-up to Node {target_node} stopped at entry {next_index}")
+                    return
+                if data.get("term", 0) > self.term:
+                    await self._step_down(data["term"])
+                    return
+                if self.term != term:
+                    return
+                if not data.get("success"):
+                    if next_index == 0:
+                        print(f"  ✗ Catch-up to Node {target_node} rejected at entry 0")
+                        return
+                    # Logs differ before this chunk - back up and compare again
+                    next_index = min(next_index - 1, data.get("log_length", 0))
+                    continue
+                    
+                self._record_acks(target_node, [entry["index"] for entry in chunk], True)
+                next_index = data.get("match_index", chunk[-1]["index"]) + 1
+                
+            print(f"  ✓ Node {target_node} caught up!")
         except Exception as e:
             print(f"  ✗ Catch-up to Node {target_node} failed: {e}")
+        finally:
+            self.catching_up.discard(target_node)
+            
+    def _catch_up_chunk(self, start: int) -> List[Dict[str, Any]]:
+        """Next catch-up chunk from `start`, bounded by entry count and encoded size."""
+        chunk = self.local_log.entries(start, start + self.catch_up_chunk_entries)
+        return chunk[:limit_batch_size(chunk, self.max_append_bytes)]
                     
-    async def receive_append_entries(self, leader_id: int, term: int, entry: Dict) -> bool:
+    async def receive_append_entries(self, leader_id: int, term: int, entries: List[Dict],
+                                     prev_log_index: Optional[int] = None,
+                                     prev_log_term: Optional[int] = None,
+                                     leader_commit: int = -1) -> Dict[str, Any]:
         """
-        Receive AppendEntries from leader (follower side).
+        Receive a batch of AppendEntries from leader (follower side).
         This is called via the RPC endpoint.
         """
+        commit_index = self.commit_index
+        result, new_entries = await self._append_from_leader(
+            leader_id, term, entries, prev_log_index, prev_log_term, leader_commit
+        )
+        if new_entries:
+            print(f"📥 Node {self.node_id} received {len(new_entries)} log entries "
+                  f"(up to {new_entries[-1]['index']}) from leader")
+            
+            self._add_event("log_replicated", {
+                "index": new_entries[-1]["index"],
+                "count": len(new_entries),
+                "from_leader": leader_id
+            })
+            
+        # An empty AppendEntries may still carry a newer commit index
+        if new_entries or self.commit_index > commit_index:
+            await self._notify_subscribers()
+        return result
+        
+    async def _append_from_leader(self, leader_id: int, term: int, entries: List[Dict],
+                                  prev_log_index: Optional[int], prev_log_term: Optional[int],
+                                  leader_commit: int) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        AppendEntries rules shared by replication and catch-up: reject a stale
+        term or a log that doesn't match at prev_log_index, drop our suffix on
+        the first conflicting entry. Returns the response and the entries added.
+        """
+        # Reject entries from a stale leader
+        if term < self.term:
+            return self._append_entries_result(False), []
+            
         # Update term if leader has higher term
-        if term >= self.term:
-            self.term = term
-            self.leader_id = leader_id
-            
-            if self.state != NodeState.FOLLOWER:
-                self.state = NodeState.FOLLOWER
-                self._add_event("state_change", {
-                    "old_state": self.state.value,
-                    "new_state": "follower",
-                    "leader": leader_id
-                })
+        self.term = term
+        self.leader_id = leader_id
+        self._record_leader_contact()
+        await self._persist([])
         
-        # Append entry to our local log
-        # Check if we already have this entry
-        if entry["index"] < len(self.local_log):
-            # Already have it
-            return True
+        if self.state is not NodeState.FOLLOWER:
+            old_state = self.state
+            self.state = NodeState.FOLLOWER
+            self._abandon_replication()
+            self._add_event("state_change", {
+                "old_state": old_state.value,
+                "new_state": "follower",
+                "leader": leader_id
+            })
+        
+        # Consistency check happens once for the whole batch
+        if prev_log_index is None:
+            prev_log_index = entries[0]["index"] - 1 if entries else len(self.local_log) - 1
+        if prev_log_index >= len(self.local_log):
+            # We're missing entries before this batch - leader will catch us up
+            return self._append_entries_result(False), []
+        if (prev_log_index >= 0 and prev_log_term is not None
+                and self.local_log.term(prev_log_index) != prev_log_term):
+            return self._append_entries_result(False), []
+        
+        # Skip entries we already have, drop our suffix on the first conflict
+        new_entries = []
+        truncate_from = None
+        for entry in entries:
+            index = entry["index"]
+            if index < len(self.local_log):
+                if self.local_log.term(index) == entry["term"]:
+                    continue
+                self.local_log.truncate(index)
+                truncate_from = index
+            new_entries.append(entry)
             
-        self.local_log.append(entry)
-        self.last_heartbeat = time.time()
+        if truncate_from is not None:
+            self._rebuild_kv_index()
+        self.local_log.extend(new_entries)
+        self._index_entries(new_entries)
+        # Entries must be on disk before we ack them
+        await self._persist(new_entries, truncate_from)
+        match_index = entries[-1]["index"] if entries else prev_log_index
+        if self.confirmed_term != term:
+            self.confirmed_index, self.confirmed_term = -1, term
+        self.confirmed_index = max(self.confirmed_index, match_index)
         
-        print(f"📥 Node {self.node_id} received log entry {entry['index']} from leader")
+        # Leader commit rides along, so no separate heartbeat is needed
+        if leader_commit > self.commit_index:
+            self.commit_index = min(leader_commit, match_index)
+        return self._append_entries_result(True, match_index), new_entries
         
-        self._add_event("log_replicated", {
-            "index": entry["index"],
-            "from_leader": leader_id
-        })
+    async def _persist(self, entries: List[Dict[str, Any]], truncate_from: Optional[int] = None):
+        """
+        Write new entries (and any truncation before them) to the on-disk log.
+        A changed term/vote is written first; with no entries this only saves that.
+        """
+        records = []
+        hard_state = (self.term, self.voted_for)
+        if hard_state != self.persisted_hard_state:
+            records.append({"hard_state": {"term": self.term, "voted_for": self.voted_for}})
+            self.persisted_hard_state = hard_state
+        if truncate_from is not None:
+            records.append({"truncate": truncate_from})
+        await self.log_writer.append(records + entries)
+        if truncate_from is not None:
+            self.durable_index = min(self.durable_index, truncate_from - 1)
+        if entries:
+            self.durable_index = max(self.durable_index, entries[-1]["index"])
         
-        await self._notify_subscribers()
-        return True
+    def _append_entries_result(self, success: bool, match_index: Optional[int] = None) -> Dict[str, Any]:
+        """Build the AppendEntries response for the leader (also serves as heartbeat ack)."""
+        return {
+            "success": success,
+            "match_index": match_index if match_index is not None else len(self.local_log) - 1,
+            "log_length": len(self.local_log),
+            "commit_index": self.commit_index,
+            "last_term": self.local_log.term(-1) if self.local_log else 0
+        }
         
-    async def receive_heartbeat(self, leader_id: int, term: int, leader_commit: int):
-        """Receive heartbeat from leader."""
-        if term >= self.term:
-            self.term = term
-            self.leader_id = leader_id
-            self.last_heartbeat = time.time()
-            
-            if self.state != NodeState.FOLLOWER and self.state != NodeState.STOPPED:
-                old_state = self.state
-                self.state = NodeState.FOLLOWER
-                self._add_event("state_change", {
-                    "old_state": old_state.value,
-                    "new_state": "follower",
-                    "leader": leader_id
-                })
-                await self._notify_subscribers()
+    def _on_heartbeat_datagram(self, kind: int, node_id: int, term: int,
+                               commit_index: int, log_length: int, addr):
+        """Handle a UDP heartbeat (follower side) or heartbeat ack (leader side)."""
+        if kind == HEARTBEAT:
+            asyncio.create_task(self._answer_heartbeat(node_id, term, commit_index, addr))
+        elif kind == HEARTBEAT_ACK and term > self.term:
+            asyncio.create_task(self._step_down(term))
+        elif kind == HEARTBEAT_ACK and self.state is NodeState.LEADER:
+            # Only escalate to an RPC if the follower is behind - and not just
+            # waiting on entries its replicator is about to send
+            if log_length < len(self.local_log) and not self.pending_entries.get(node_id):
+                asyncio.create_task(self._send_missing_entries(node_id, log_length))
                 
+    async def _answer_heartbeat(self, leader_id: int, term: int, leader_commit: int, addr):
+        """Apply a UDP heartbeat and reply with our log state."""
+        await self.receive_heartbeat(leader_id, term, leader_commit)
+        if self.heartbeat_transport is not None:
+            self.heartbeat_transport.sendto(
+                HEARTBEAT_DATAGRAM.pack(HEARTBEAT_ACK, self.node_id, self.term,
+                                        self.commit_index, len(self.local_log)),
+                addr
+            )
+            
+    async def receive_heartbeat(self, leader_id: int, term: int, leader_commit: int):
+        """
+        Receive heartbeat from leader.
+        A heartbeat carries no log position, so the commit index only moves up
+        to what AppendEntries from this leader's term already confirmed.
+        """
+        if term < self.term:
+            return  # Stale leader
+            
+        self.term = term
+        self.leader_id = leader_id
+        self._record_leader_contact()
+        await self._persist([])
+        
+        if self.state is not NodeState.FOLLOWER and self.state is not NodeState.STOPPED:
+            old_state = self.state
+            self.state = NodeState.FOLLOWER
+            self._abandon_replication()
+            self._add_event("state_change", {
+                "old_state": old_state.value,
+                "new_state": "follower",
+                "leader": leader_id
+            })
+            await self._notify_subscribers()
+            
         # Update commit index
-        if leader_commit > self.commit_index:
-            self.commit_index = min(leader_commit, len(self.local_log) - 1)
+        if self.confirmed_term == term:
+            commit_index = min(leader_commit, self.confirmed_index)
+            if commit_index > self.commit_index:
+                self.commit_index = commit_index
+                await self._notify_subscribers()
             
     async def receive_commit(self, commit_index: int):
         """Receive commit notification from leader."""
@@ -436,50 +1058,42 @@ class RaftClusterService:
             self.commit_index = commit_index
             await self._notify_subscribers()
             
-    async def receive_catch_up(self, leader_id: int, term: int, entries: list, leader_commit: int):
+    async def receive_catch_up(self, leader_id: int, term: int, entries: list, leader_commit: int,
+                               prev_log_index: Optional[int] = None,
+                               prev_log_term: Optional[int] = None) -> Dict[str, Any]:
         """
         Receive missing log entries from leader (log catch-up).
-        Called when follower is behind and needs to sync.
+        Called when follower is behind or has diverged; same checks as AppendEntries.
         """
-        if term >= self.term:
-            self.term = term
-            self.leader_id = leader_id
-            self.last_heartbeat = time.time()
-            
-        added_count = 0
-        for entry in entries:
-            # Only add if we don't already have this entry
-            if entry["index"] >= len(self.local_log):
-                self.local_log.append(entry)
-                added_count += 1
-                
-        if added_count > 0:
-            print(f"📥 Node {self.node_id} caught up: added {added_count} entries (now has {len(self.local_log)})")
+        result, added = await self._append_from_leader(
+            leader_id, term, entries, prev_log_index, prev_log_term, leader_commit
+        )
+        if added:
+            print(f"📥 Node {self.node_id} caught up: added {len(added)} entries (now has {len(self.local_log)})")
             
             self._add_event("log_catch_up", {
-                "entries_received": added_count,
+                "entries_received": len(added),
                 "from_leader": leader_id,
                 "new_log_length": len(self.local_log)
             })
             
-        # Update commit index
-        if leader_commit > self.commit_index:
-            self.commit_index = min(leader_commit, len(self.local_log) - 1)
-            
         await self._notify_subscribers()
-        return True
+        return result
             
     async def receive_promotion(self, term: int, previous_leader: int):
         """
         Receive promotion request - this node should become leader.
         Called via RPC when another node wants to transfer leadership.
         """
-        if term >= self.term and self.state != NodeState.LEADER:
+        if term >= self.term and self.state is not NodeState.LEADER:
             print(f"🎯 Node {self.node_id} promoted to LEADER by Node {previous_leader}")
             self.term = term
+            self.voted_for = self.node_id
+            await self._persist([])
             old_state = self.state
             self.state = NodeState.LEADER
             self.leader_id = self.node_id
+            self.match_index = {}  # Unknown until followers ack in this term
             
             self._add_event("state_change", {
                 "old_state": old_state.value,
@@ -493,6 +1107,58 @@ class RaftClusterService:
             return True
         return False
             
+    async def handle_rpc(self, rpc: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Dispatch an inter-node RPC to its handler.
+        Shared by the persistent stream and the HTTP fallback endpoints.
+        """
+        if rpc == RPC_APPEND_ENTRIES:
+            entries = data.get('entries')
+            if entries is None:
+                entries = [data['entry']] if data.get('entry') else []
+            result = await self.receive_append_entries(
+                data.get('leader_id'),
+                data.get('term'),
+                entries,
+                prev_log_index=data.get('prev_log_index'),
+                prev_log_term=data.get('prev_log_term'),
+                leader_commit=data.get('leader_commit', -1)
+            )
+            return {**result, "node_id": self.node_id, "term": self.term}
+            
+        if rpc == RPC_HEARTBEAT:
+            await self.receive_heartbeat(
+                leader_id=data.get('leader_id'),
+                term=data.get('term'),
+                leader_commit=data.get('leader_commit', -1)
+            )
+            # Return log_length so leader knows if we need catch-up
+            return {"success": True, "node_id": self.node_id, "log_length": len(self.local_log)}
+            
+        if rpc == RPC_COMMIT:
+            await self.receive_commit(data.get('commit_index', -1))
+            return {"success": True}
+            
+        if rpc == RPC_CATCH_UP:
+            result = await self.receive_catch_up(
+                leader_id=data.get('leader_id'),
+                term=data.get('term', 0),
+                entries=data.get('entries', []),
+                leader_commit=data.get('leader_commit', -1),
+                prev_log_index=data.get('prev_log_index'),
+                prev_log_term=data.get('prev_log_term')
+            )
+            return {**result, "node_id": self.node_id, "term": self.term}
+            
+        if rpc == RPC_PROMOTE:
+            success = await self.receive_promotion(
+                term=data.get('term', 0),
+                previous_leader=data.get('previous_leader', 0)
+            )
+            return {"success": success, "node_id": self.node_id}
+            
+        raise ValueError(f"Unknown RPC: {rpc}")
+        
     def _add_event(self, event_type: str, details: Dict[str, Any]):
         """Add a Raft event."""
         event = RaftEvent(
@@ -502,20 +1168,40 @@ class RaftClusterService:
             term=self.term,
             details=details
         )
-        self.events.append(event)
-        
-        if len(self.events) > self.max_events:
-            self.events = self.events[-self.max_events:]
+        self.events.append(event)  # Oldest event drops off once maxlen is reached
+        self.generation += 1
             
     async def _notify_subscribers(self):
-        """Notify WebSocket subscribers."""
-        status = self.get_status()
+        """Notify WebSocket subscribers - the message is serialized once for all of them."""
+        if not self.subscribers:
+            return
+        message = self.status_message()
         for callback in self.subscribers:
             try:
-                await callback(status.to_dict())
+                await callback(message)
             except Exception as e:
                 print(f"Subscriber error: {e}")
                 
+    def status_message(self) -> str:
+        """Current status as a serialized WebSocket status_update message."""
+        self.status_dict()
+        key, status, message = self._status_cache
+        if message is None:
+            message = orjson.dumps({"type": "status_update", "data": status}).decode()
+            self._status_cache = (key, status, message)
+        return message
+        
+    def status_dict(self) -> Dict[str, Any]:
+        """
+        get_status().to_dict(), rebuilt only when one of its fields changed.
+        The dict is shared between callers - don't mutate it.
+        """
+        key = (self.state, self.term, self.voted_for, len(self.local_log),
+               self.commit_index, self.last_heartbeat, self.leader_id)
+        if self._status_cache[0] != key:
+            self._status_cache = (key, self.get_status().to_dict(), None)
+        return self._status_cache[1]
+                
     def subscribe(self, callback: Callable):
         self.subscribers.append(callback)
         
@@ -532,28 +1218,74 @@ class RaftClusterService:
             voted_for=self.voted_for,
             log_length=len(self.local_log),
             commit_index=self.commit_index,
-            last_heartbeat=self.last_heartbeat,
-            is_leader=self.state == NodeState.LEADER,
+            last_heartbeat=self.last_heartbeat + self.wall_clock_offset,
+            is_leader=self.is_leader,
             leader_id=self.leader_id
         )
         
     def get_events(self, limit: int = 50) -> List[Dict[str, Any]]:
-        return [e.to_dict() for e in self.events[-limit:]]
+        recent = itertools.islice(reversed(self.events), limit)
+        return [e.to_dict() for e in recent][::-1]
         
     def get_log(self) -> List[Dict[str, Any]]:
         """Get this node's local log."""
-        return self.local_log.copy()
+        return self.local_log.entries()
+        
+    def log_message(self) -> str:
+        """Local log as a serialized WebSocket "log" message, rebuilt only when the log changes."""
+        version = self.local_log.version
+        if self._log_message_cache[0] != version:
+            body = orjson.dumps({"type": "log", "data": self.local_log.entries()}).decode()
+            self._log_message_cache = (version, body)
+        return self._log_message_cache[1]
     
+    def record_db_log(self, log: Dict[str, Any]):
+        """Remember a raft_log row this node just committed to the database."""
+        self.recent_db_logs.appendleft(log)
+        
+    def seed_db_logs(self, logs: List[Dict[str, Any]]):
+        """Seed the recent raft_log cache from a database read (leader only)."""
+        if self.state is not NodeState.LEADER:
+            return
+        # Keep rows recorded while the read was in flight
+        newest_id = logs[0]["id"] if logs else 0
+        newer = [log for log in self.recent_db_logs if log["id"] > newest_id]
+        self.recent_db_logs.clear()
+        self.recent_db_logs.extend(newer + logs)
+        self.recent_db_logs_term = self.term
+        
+    def get_recent_db_logs(self, limit: int = 50) -> Optional[List[Dict[str, Any]]]:
+        """Recent raft_log rows from memory, or None if the database must be read."""
+        if (self.state is not NodeState.LEADER or self.recent_db_logs_term != self.term
+                or limit > self.recent_db_logs.maxlen):
+            return None
+        return list(itertools.islice(self.recent_db_logs, limit))
+        
     def get_replication_status(self, log_index: int) -> Dict[int, bool]:
-        """Get which nodes have acknowledged a specific log entry."""
-        acks = self.replication_acks.get(log_index, set())
-        return {1: 1 in acks, 2: 2 in acks, 3: 3 in acks}
+        """Get which nodes are known to hold a specific log entry."""
+        return {
+            node_id: (self.durable_index if node_id == self.node_id else self.match_index.get(node_id, -1)) >= log_index
+            for node_id in self.cluster_ids
+        }
+        
+    def _index_entries(self, entries: List[Dict[str, Any]]):
+        """Point kv_index at the newest entry for each key; a delete marker drops its key."""
+        for entry in entries:
+            key = entry.get("key")
+            if key is None:
+                continue
+            self.kv_index[key] = entry["index"]
+            if key.endswith(DELETED_SUFFIX):
+                self.kv_index.pop(key[:-len(DELETED_SUFFIX)], None)
+                
+    def _rebuild_kv_index(self):
+        """Rebuild kv_index from scratch after the log was truncated."""
+        self.kv_index = {}
+        self._index_entries(self.local_log)
         
     async def get_replicated_data(self, key: str) -> Optional[Any]:
-        for entry in reversed(self.local_log):
-            if entry.get('key') == key:
-                return entry.get('value')
-        return None
+        index = self.kv_index.get(key)
+        return self.local_log.value(index) if index is not None else None
 
 
 # Global instance
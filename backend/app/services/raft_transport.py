@@ -0,0 +1,187 @@
+"""
+Raft Transport - Persistent per-peer RPC stream and UDP heartbeats.
+The leader keeps one long-lived TCP connection open to each follower's Raft
+port; requests and acks are multiplexed over it as length-prefixed binary
+frames and correlated by request id. Heartbeats are fixed-size UDP datagrams.
+"""
+import asyncio
+import itertools
+import struct
+import msgpack
+from typing import Optional, Dict, Any, Tuple, Callable, Awaitable
+
+
+# RPC names (shared by the stream and the HTTP fallback endpoints)
+RPC_APPEND_ENTRIES = "append_entries"
+RPC_HEARTBEAT = "heartbeat"
+RPC_COMMIT = "commit"
+RPC_CATCH_UP = "catch_up"
+RPC_PROMOTE = "promote"
+
+# HTTP fallback paths under /api/raft/rpc/
+RPC_PATHS = {
+    RPC_APPEND_ENTRIES: "append-entries",
+    RPC_HEARTBEAT: "heartbeat",
+    RPC_COMMIT: "commit",
+    RPC_CATCH_UP: "catch-up",
+    RPC_PROMOTE: "promote"
+}
+
+# Content type for msgpack-encoded HTTP fallback bodies
+MSGPACK_MIMETYPE = "application/msgpack"
+
+# Stream frame: u32 length of what follows, one tag byte, msgpack payload
+FRAME_LENGTH = struct.Struct('<I')
+
+# One tag byte per frame identifies the message type
+TAG_RESPONSE = 0
+RPC_TAGS = {
+    RPC_APPEND_ENTRIES: 1,
+    RPC_HEARTBEAT: 2,
+    RPC_COMMIT: 3,
+    RPC_CATCH_UP: 4,
+    RPC_PROMOTE: 5
+}
+TAG_RPCS = {tag: rpc for rpc, tag in RPC_TAGS.items()}
+
+
+def encode_frame(tag: int, payload: Dict[str, Any]) -> bytes:
+    """Encode a frame as a tag byte followed by a msgpack payload."""
+    return bytes((tag,)) + msgpack.packb(payload, use_bin_type=True)
+
+
+def decode_frame(frame: bytes) -> Tuple[int, Dict[str, Any]]:
+    """Split a frame into its tag and decoded payload."""
+    return frame[0], msgpack.unpackb(frame[1:], raw=False)
+
+
+def write_frame(writer: asyncio.StreamWriter, tag: int, payload: Dict[str, Any]):
+    """Queue a length-prefixed frame on a TCP stream."""
+    frame = encode_frame(tag, payload)
+    writer.write(FRAME_LENGTH.pack(len(frame)) + frame)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, Any]]:
+    """Read one length-prefixed frame off a TCP stream."""
+    (length,) = FRAME_LENGTH.unpack(await reader.readexactly(FRAME_LENGTH.size))
+    return decode_frame(await reader.readexactly(length))
+
+
+async def serve_peer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                     handle_rpc: Callable[[str, Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+    """
+    Answer RPCs from one peer connection.
+    Frames are handled in arrival order so batches stay in log order;
+    each ack carries the request id it answers.
+    """
+    try:
+        while True:
+            tag, payload = await read_frame(reader)
+            request_id = payload.pop("rid", None)
+            result = await handle_rpc(TAG_RPCS[tag], payload)
+            write_frame(writer, TAG_RESPONSE, {"rid": request_id, **result})
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass  # Peer went away
+    finally:
+        writer.close()
+
+
+class PeerStream:
+    """
+    Long-lived TCP connection to a single peer's Raft port.
+    Requests are sent without waiting for earlier acks; responses are
+    matched back to their caller by request id.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        self._connect_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self):
+        """Open the connection if it isn't already open (raises OSError/TimeoutError if it can't)."""
+        async with self._connect_lock:
+            if self.connected:
+                return
+            reader, self._writer = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), timeout=2
+            )
+            self._reader = asyncio.create_task(self._read_loop(reader, self._writer))
+
+    async def request(self, rpc: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send an RPC over the stream and wait for its ack."""
+        await self.connect()
+
+        request_id = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            write_frame(self._writer, RPC_TAGS[rpc], {"rid": request_id, **payload})
+            await self._writer.drain()
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _read_loop(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Resolve pending requests as their acks arrive."""
+        try:
+            while True:
+                tag, payload = await read_frame(reader)
+                if tag != TAG_RESPONSE:
+                    continue
+                future = self._pending.get(payload.pop("rid", None))
+                if future is not None and not future.done():
+                    future.set_result(payload)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            # Connection is gone - fail everything still waiting on it
+            if self._writer is writer:
+                self._writer = None
+                writer.close()
+                self._fail_pending()
+
+    def _fail_pending(self):
+        """Fail every request still waiting for an ack."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError(f"Stream to {self.host}:{self.port} closed"))
+        self._pending.clear()
+
+    async def close(self):
+        """Close the connection."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._reader is not None:
+            self._reader.cancel()
+            self._reader = None
+        # The read loop no longer owns the writer, so it won't do this itself
+        self._fail_pending()
+
+
+# Heartbeat datagram: kind, node_id, term, commit_index, log_length
+HEARTBEAT_DATAGRAM = struct.Struct('<BBIqI')
+HEARTBEAT = 0      # leader -> follower
+HEARTBEAT_ACK = 1  # follower -> leader, same shape
+
+
+class HeartbeatProtocol(asyncio.DatagramProtocol):
+    """Receives heartbeat datagrams and hands the decoded fields to a callback."""
+
+    def __init__(self, on_heartbeat: Callable[..., None]):
+        self.on_heartbeat = on_heartbeat
+
+    def datagram_received(self, data: bytes, addr):
+        if len(data) != HEARTBEAT_DATAGRAM.size:
+            return
+        self.on_heartbeat(*HEARTBEAT_DATAGRAM.unpack(data), addr)
@@ -1,13 +1,15 @@
 """
 Task Service - Handles CRUD operations with Raft replication.
 """
-import json
-import uuid
-from typing import List, Optional
+import orjson
+from datetime import datetime
+from typing import Any, Dict, List, Optional
 from sqlalchemy import select, update, delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..models.task import Task, RaftLog
+from ..models.task import (
+    Task, RaftLog, TASK_COLUMNS, uuid7, parse_task_id, RAFT_LOG_COLUMNS, task_row_to_dict, raft_log_row_to_dict
+)
 from .raft_cluster import get_raft_service
 
 
@@ -22,7 +24,10 @@ class TaskService:
         """Create a new task and replicate via Raft."""
         raft = get_raft_service()
         
-        task_id = str(uuid.uuid4())
+        task_id = str(uuid7())
+        # Timestamps are set here rather than by MySQL, so the in-memory task
+        # is complete and needs no refresh after the INSERT
+        now = datetime.now().replace(microsecond=0)
         task = Task(
             id=task_id,
             title=title,
@@ -30,46 +35,54 @@ class TaskService:
             priority=priority,
             status="pending",
             created_by_node=raft.node_id,
-            log_index=len(raft.local_log)
+            created_at=now,
+            updated_at=now
         )
         
         # Replicate through Raft if we're leader
-        if raft.state.value == "leader":
-            success = await raft.replicate_data(
+        raft_log = None
+        if raft.is_leader:
+            log_index = await raft.replicate_data(
                 f"task:{task_id}",
                 task.to_dict()
             )
-            if not success:
+            if log_index is None:
                 return None
+            task.log_index = log_index
                 
             # Log the operation
             raft_log = RaftLog(
                 term=raft.term,
-                log_index=len(raft.local_log) - 1,
+                log_index=log_index,
                 operation="create",
                 task_id=task_id,
-                data=json.dumps(task.to_dict()),
-                committed=True
+                data=orjson.dumps(task.to_dict()).decode(),
+                committed=True,
+                created_at=datetime.now().replace(microsecond=0)
             )
-            self.session.add(raft_log)
         
-        self.session.add(task)
+        # Task and its log row go out in a single flush
+        self.session.add_all([task, raft_log] if raft_log is not None else [task])
         await self.session.commit()
-        await self.session.refresh(task)
+        
+        if raft_log is not None:
+            raft.record_db_log(raft_log.to_dict())
         
         return task
         
     async def get_task(self, task_id: str) -> Optional[Task]:
         """Get a task by ID."""
+        if parse_task_id(task_id) is None:
+            return None
         result = await self.session.execute(
             select(Task).where(Task.id == task_id)
         )
         return result.scalar_one_or_none()
         
-    async def get_all_tasks(self) -> List[Task]:
-        """Get all tasks."""
-        result = await self.session.execute(select(Task))
-        return result.scalars().all()
+    async def get_all_tasks(self) -> List[Dict[str, Any]]:
+        """Get all tasks as dicts (plain column rows, no ORM instances)."""
+        result = await self.session.execute(select(*TASK_COLUMNS))
+        return [task_row_to_dict(row) for row in result.all()]
         
     async def update_task(self, task_id: str, **kwargs) -> Optional[Task]:
         """Update a task."""
@@ -83,29 +96,35 @@ class TaskService:
         for key, value in kwargs.items():
             if hasattr(task, key) and value is not None:
                 setattr(task, key, value)
+        task.updated_at = datetime.now().replace(microsecond=0)
         
         # Replicate through Raft if we're leader
-        if raft.state.value == "leader":
-            success = await raft.replicate_data(
+        raft_log = None
+        if raft.is_leader:
+            log_index = await raft.replicate_data(
                 f"task:{task_id}",
                 task.to_dict()
             )
-            if not success:
+            if log_index is None:
                 return None
+            task.log_index = log_index
                 
             # Log the operation
             raft_log = RaftLog(
                 term=raft.term,
-                log_index=len(raft.local_log) - 1,
+                log_index=log_index,
                 operation="update",
                 task_id=task_id,
-                data=json.dumps(kwargs),
-                committed=True
+                data=orjson.dumps(kwargs).decode(),
+                committed=True,
+                created_at=datetime.now().replace(microsecond=0)
             )
             self.session.add(raft_log)
         
         await self.session.commit()
-        await self.session.refresh(task)
+        
+        if raft_log is not None:
+            raft.record_db_log(raft_log.to_dict())
         
         return task
         
@@ -113,38 +132,47 @@ class TaskService:
         """Delete a task."""
         raft = get_raft_service()
         
-        task = await self.get_task(task_id)
-        if not task:
+        if parse_task_id(task_id) is None:
+            return False
+        # Delete first (uncommitted) - the row count tells us if the task existed
+        result = await self.session.execute(delete(Task).where(Task.id == task_id))
+        if result.rowcount == 0:
+            await self.session.rollback()
             return False
             
         # Replicate deletion through Raft if we're leader
-        if raft.state.value == "leader":
-            success = await raft.replicate_data(
+        raft_log = None
+        if raft.is_leader:
+            log_index = await raft.replicate_data(
                 f"task:{task_id}:deleted",
                 True
             )
-            if not success:
+            if log_index is None:
+                await self.session.rollback()
                 return False
                 
             # Log the operation
             raft_log = RaftLog(
                 term=raft.term,
-                log_index=len(raft.local_log) - 1,
+                log_index=log_index,
                 operation="delete",
                 task_id=task_id,
                 data=None,
-                committed=True
+                committed=True,
+                created_at=datetime.now().replace(microsecond=0)
             )
             self.session.add(raft_log)
         
-        await self.session.delete(task)
         await self.session.commit()
         
+        if raft_log is not None:
+            raft.record_db_log(raft_log.to_dict())
+        
         return True
         
-    async def get_raft_logs(self, limit: int = 50) -> List[RaftLog]:
-        """Get recent Raft log entries."""
+    async def get_raft_logs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Get recent Raft log entries as dicts."""
         result = await self.session.execute(
-            select(RaftLog).order_by(RaftLog.id.desc()).limit(limit)
+            select(*RAFT_LOG_COLUMNS).order_by(RaftLog.id.desc()).limit(limit)
         )
-        return result.scalars().all()
+        return [raft_log_row_to_dict(row) for row in result.all()]
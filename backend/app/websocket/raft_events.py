@@ -2,79 +2,75 @@
 WebSocket handlers for real-time Raft status updates.
 """
 import asyncio
-import json
+import orjson
 from quart import Blueprint, websocket
 from ..services.raft_cluster import get_raft_service
 
 ws_bp = Blueprint('websocket', __name__)
 
+# Status is pushed on change only; an idle socket gets a keepalive this often
+KEEPALIVE_INTERVAL = 5.0
+KEEPALIVE_MESSAGE = orjson.dumps({"type": "keepalive"}).decode()
+
 
 @ws_bp.websocket('/ws/raft')
 async def raft_websocket():
     """WebSocket endpoint for real-time Raft status updates."""
     raft = get_raft_service()
     
-    # Queue for sending messages to this client
+    # Queue of serialized messages for this client
     send_queue = asyncio.Queue()
+    last_status = None  # Last status message queued for this client
     
-    async def on_status_update(status: dict):
-        """Callback for Raft status updates."""
-        await send_queue.put({
-            "type": "status_update",
-            "data": status
-        })
+    async def on_status_update(message: str):
+        """Callback for Raft status updates (skipped if nothing changed)."""
+        nonlocal last_status
+        if message == last_status:
+            return
+        last_status = message
+        await send_queue.put(message)
     
     # Subscribe to updates
     raft.subscribe(on_status_update)
     
     try:
         # Send initial status
-        await websocket.send(json.dumps({
+        last_status = raft.status_message()
+        await websocket.send(orjson.dumps({
             "type": "initial_status",
-            "data": raft.get_status().to_dict()
-        }))
+            "data": raft.status_dict()
+        }).decode())
         
         # Handle bidirectional communication
         async def sender():
             while True:
-                message = await send_queue.get()
-                await websocket.send(json.dumps(message))
+                try:
+                    message = await asyncio.wait_for(send_queue.get(), KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    message = KEEPALIVE_MESSAGE
+                await websocket.send(message)
         
         async def receiver():
             while True:
                 data = await websocket.receive()
                 # Handle incoming messages (e.g., requests for specific data)
                 try:
-                    msg = json.loads(data)
+                    msg = orjson.loads(data)
                     if msg.get("type") == "get_events":
                         events = raft.get_events(limit=msg.get("limit", 50))
-                        await websocket.send(json.dumps({
+                        await websocket.send(orjson.dumps({
                             "type": "events",
                             "data": events
-                        }))
+                        }).decode())
                     elif msg.get("type") == "get_log":
-                        log = raft.get_log()
-                        await websocket.send(json.dumps({
-                            "type": "log",
-                            "data": log
-                        }))
-                except json.JSONDecodeError:
+                        await websocket.send(raft.log_message())
+                except orjson.JSONDecodeError:
                     pass
         
-        # Periodic status updates
-        async def periodic_updates():
-            while True:
-                await asyncio.sleep(0.5)  # Send status every 500ms
-                await send_queue.put({
-                    "type": "status_update",
-                    "data": raft.get_status().to_dict()
-                })
-        
         # Run all tasks concurrently
         await asyncio.gather(
             sender(),
-            receiver(),
-            periodic_updates()
+            receiver()
         )
         
     finally:
@@ -0,0 +1 @@
+# Lets pytest import the `app` package from backend/ whichever directory it runs from
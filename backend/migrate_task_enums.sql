@@ -0,0 +1,28 @@
+-- Convert tasks.status / tasks.priority from ENUM strings to TINYINT codes.
+-- Codes match TaskStatus / TaskPriority in app/models/task.py.
+-- Run once against an existing database; fresh databases are created with TINYINT.
+USE raft_tasks;
+
+ALTER TABLE tasks
+    ADD COLUMN status_code TINYINT UNSIGNED NULL,
+    ADD COLUMN priority_code TINYINT UNSIGNED NULL;
+
+UPDATE tasks SET
+    status_code = CASE status
+        WHEN 'pending' THEN 0
+        WHEN 'in_progress' THEN 1
+        WHEN 'completed' THEN 2
+    END,
+    priority_code = CASE priority
+        WHEN 'low' THEN 0
+        WHEN 'medium' THEN 1
+        WHEN 'high' THEN 2
+    END;
+
+ALTER TABLE tasks
+    DROP COLUMN status,
+    DROP COLUMN priority;
+
+ALTER TABLE tasks
+    CHANGE COLUMN status_code status TINYINT UNSIGNED NULL,
+    CHANGE COLUMN priority_code priority TINYINT UNSIGNED NULL;
@@ -0,0 +1,16 @@
+-- Convert tasks.id from CHAR(36) UUID strings to BINARY(16).
+-- Existing ids keep their value; new tasks get time-ordered UUIDv7 ids.
+-- Run once against an existing database; fresh databases are created with BINARY(16).
+USE raft_tasks;
+
+ALTER TABLE tasks ADD COLUMN id_bin BINARY(16) NULL;
+
+UPDATE tasks SET id_bin = UNHEX(REPLACE(id, '-', ''));
+
+ALTER TABLE tasks
+    DROP PRIMARY KEY,
+    DROP COLUMN id;
+
+ALTER TABLE tasks
+    CHANGE COLUMN id_bin id BINARY(16) NOT NULL FIRST,
+    ADD PRIMARY KEY (id);
@@ -0,0 +1,47 @@
+import asyncio
+
+import msgpack
+
+from app.services.log_writer import LogWriter
+
+
+def _entry(index):
+    return {"index": index, "term": 1, "key": f"k{index}", "value": index, "timestamp": 0.0}
+
+
+def test_torn_tail_is_cut_before_new_appends(tmp_path):
+    path = str(tmp_path / "raft.log")
+    with open(path, 'wb') as f:
+        f.write(msgpack.packb(_entry(0), use_bin_type=True))
+        f.write(msgpack.packb(_entry(1), use_bin_type=True))
+        torn = msgpack.packb(_entry(2), use_bin_type=True)
+        f.write(torn[:len(torn) // 2])
+
+    entries, _ = LogWriter.load(path)
+    assert [e["index"] for e in entries] == [0, 1]
+
+    async def append_more():
+        writer = LogWriter(path)
+        await writer.start()
+        await writer.append([_entry(2), _entry(3)])
+        await writer.close()
+    asyncio.run(append_more())
+
+    entries, _ = LogWriter.load(path)
+    assert [e["index"] for e in entries] == [0, 1, 2, 3]
+
+
+def test_hard_state_and_truncation_replay(tmp_path):
+    path = str(tmp_path / "raft.log")
+
+    async def write():
+        writer = LogWriter(path)
+        await writer.start()
+        await writer.append([{"hard_state": {"term": 1, "voted_for": 1}}, _entry(0), _entry(1)])
+        await writer.append([{"hard_state": {"term": 3, "voted_for": 2}}, {"truncate": 1}])
+        await writer.close()
+    asyncio.run(write())
+
+    entries, hard_state = LogWriter.load(path)
+    assert [e["index"] for e in entries] == [0]
+    assert hard_state == {"term": 3, "voted_for": 2}
@@ -0,0 +1,61 @@
+import asyncio
+
+import msgpack
+
+from app.main import create_app
+from app.services.raft_cluster import NodeState, init_raft_service
+from app.services.raft_transport import MSGPACK_MIMETYPE
+
+CLUSTER_NODES = ["127.0.0.1:19001", "127.0.0.1:19002", "127.0.0.1:19003"]
+
+
+def test_log_endpoint_with_entries(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    async def fetch_log():
+        raft = init_raft_service(1, CLUSTER_NODES)
+        raft.local_log.append({"index": 0, "term": 1, "key": "task:1", "value": {"id": 1}, "timestamp": 0.0})
+        raft.durable_index = 0
+        raft.match_index = {2: 0}
+        # Serve database_log from the leader's cache instead of MySQL
+        raft.state = NodeState.LEADER
+        raft.recent_db_logs_term = raft.term
+
+        client = create_app(1).test_client()
+        response = await client.get('/api/raft/log')
+        return response.status_code, await response.get_json()
+
+    status, body = asyncio.run(fetch_log())
+    assert status == 200
+    assert body["log_length"] == 1
+    assert body["memory_log"][0]["key"] == "task:1"
+    assert body["memory_log"][0]["replication"] == {"1": True, "2": True, "3": False}
+
+
+def test_rpc_replies_in_request_format(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    heartbeat = {"leader_id": 1, "term": 1, "leader_commit": -1}
+
+    async def send_heartbeats():
+        raft = init_raft_service(2, CLUSTER_NODES)
+        await raft.log_writer.start()
+        client = create_app(2).test_client()
+
+        # Peers from before the msgpack transport post JSON and read JSON back
+        json_response = await client.post('/api/raft/rpc/heartbeat', json=heartbeat)
+        msgpack_response = await client.post(
+            '/api/raft/rpc/heartbeat',
+            data=msgpack.packb(heartbeat, use_bin_type=True),
+            headers={"Content-Type": MSGPACK_MIMETYPE}
+        )
+        await raft.log_writer.close()
+        return (
+            json_response.mimetype, await json_response.get_json(),
+            msgpack_response.mimetype, msgpack.unpackb(await msgpack_response.get_data(), raw=False)
+        )
+
+    json_type, json_body, msgpack_type, msgpack_body = asyncio.run(send_heartbeats())
+    assert json_type == 'application/json'
+    assert json_body["success"] is True
+    assert msgpack_type == MSGPACK_MIMETYPE
+    assert msgpack_body["success"] is True